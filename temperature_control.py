@@ -8,9 +8,8 @@ Main script for temperature control system.
 import os
 import sys
 import logging
-import time
 import signal
-import argparse
+import threading
 from datetime import datetime
 
 # Add parent directory to path to allow imports from the package
@@ -22,6 +21,7 @@ from thermal_control.core.temperature_control import TemperatureControl
 from thermal_control.core.data_manager import DataManager
 from thermal_control.utils.port_selection import select_ports_interactive
 from thermal_control.utils.logger import setup_logger, get_default_log_file, Colors
+from thermal_control.utils.prompt import confirm
 from thermal_control.utils.config_reader import read_config, get_correction_parameters
 from thermal_control.ui.interactive import InteractiveUI
 from thermal_control.ui.cli import create_parser, confirm_settings, direct_command_mode
@@ -32,19 +32,22 @@ def main():
     # Parse command-line arguments
     parser = create_parser()
     args = parser.parse_args()
+    run_start = datetime.now()
     
     # Set up logging
     log_file = args.log_file or get_default_log_file()
     logger = setup_logger(log_file=log_file, level=getattr(logging, args.log_level), console=not args.quiet)
     
-    # Handle interrupt signals gracefully
-    stop_requested = False
+    # Handle interrupt signals gracefully: the first one asks the running mode to stop
+    shutdown_event = threading.Event()
+    temp_control = None
     
     def signal_handler(sig, frame):
-        nonlocal stop_requested
-        if not stop_requested:
+        if not shutdown_event.is_set():
             logger.info("Interrupt received, cleaning up...")
-            stop_requested = True
+            shutdown_event.set()
+            if temp_control is not None:
+                temp_control.request_shutdown()
         else:
             logger.warning("Second interrupt received, exiting immediately...")
             sys.exit(1)
@@ -62,7 +65,9 @@ def main():
     
     if not tec_port or (not arduino_port and not args.no_arduino):
         try:
-            tec_port, arduino_port = select_ports_interactive()
+            tec_port, arduino_port = select_ports_interactive(tec_port, arduino_port, assume_yes=args.yes)
+            if args.no_arduino:
+                arduino_port = None
         except Exception as e:
             logger.error(f"Error selecting ports: {e}")
             return 1
@@ -78,7 +83,7 @@ def main():
     data_manager = DataManager()
     
     # Create temperature control system
-    temp_control = TemperatureControl(tec_controller, arduino_interface, data_manager)
+    temp_control = TemperatureControl(tec_controller, arduino_interface, data_manager, shutdown_event)
 
     # Load interpolation model if specified
     temp_control.load_interpolation_model()
@@ -88,6 +93,10 @@ def main():
     config = read_config()
     correction_params = get_correction_parameters(config)
     
+    # Data directories, looked up once
+    raw_data_dir = config.get('paths', 'raw_data_dir', fallback='data/raw')
+    processed_data_dir = config.get('paths', 'processed_data_dir', fallback='data/processed')
+    
     # Update correction parameters
     if args.a is not None or args.b is not None or args.c is not None or args.use_ambient or args.ambient_ref is not None or args.ambient_coeff is not None:
         # Use command-line parameters
@@ -110,67 +119,79 @@ def main():
             ambient_coeff=correction_params['ambient_coeff']
         )
     
-    try:
-        # Connect to devices
-        if not temp_control.connect_devices():
-            logger.error("Failed to connect to devices. Exiting.")
-            return 1
+    # Choose the output file now, so an auto-generated name carries the start time of the run
+    output_file = args.output
+    if not output_file:
+        # Auto-generate filename
+        timestamp = run_start.strftime("%Y%m%d_%H%M%S")
         
-        # Run in the selected mode
-        if args.direct:
-            # Direct command mode
-            direct_command_mode(tec_controller)
-        elif args.monitor:
-            # Monitor-only mode
-            run_monitor_mode(temp_control)
+        # Create filename with relevant information
+        if args.experiment and args.start_temp is not None and args.stop_temp is not None and args.increment is not None:
+            # For experiments, include temperature range info
+            filename = f"{timestamp}_{args.start_temp:.1f}_{args.stop_temp:.1f}_{args.increment:.1f}_{args.stab_time}.csv"
         elif args.set_temp is not None:
-            # Set and monitor a single temperature
-            run_single_temperature_mode(temp_control, args.set_temp, not args.no_correction)
-        elif args.experiment and args.start_temp is not None and args.stop_temp is not None and args.increment is not None:
-            # Run an experiment
-            run_experiment_mode(temp_control, args.start_temp, args.stop_temp, args.increment, args.stab_time, not args.no_correction)
+            # For single temperature, include target temperature
+            filename = f"{timestamp}_{args.set_temp:.1f}.csv"
         else:
-            # Interactive mode (default)
-            interactive_ui = InteractiveUI(temp_control, data_manager)
-            interactive_ui.run()
+            # Default filename
+            filename = f"temperature_data_{timestamp}.csv"
         
+        output_file = os.path.join(raw_data_dir, filename)
+    
+    try:
+        # The devices are disconnected when this block ends, so saving and
+        # analysis below don't hold them open
+        with temp_control:
+            # Connect to devices
+            if not temp_control.connect_devices():
+                logger.error("Failed to connect to devices. Exiting.")
+                return 1
+            
+            # Stream collected data to the output file while running, so long runs
+            # keep every sample and an interrupted run loses at most the unflushed tail
+            if not args.direct:
+                data_manager.start_streaming(output_file)
+            
+            # Run in the selected mode
+            if args.direct:
+                # Direct command mode
+                direct_command_mode(tec_controller, shutdown_event)
+            elif args.monitor:
+                # Monitor-only mode
+                run_monitor_mode(temp_control, shutdown_event)
+            elif args.script:
+                # Run a command script without prompting
+                InteractiveUI(temp_control, data_manager).run_script(args.script, shutdown_event)
+            elif args.set_temp is not None:
+                # Set and monitor a single temperature
+                run_single_temperature_mode(temp_control, args.set_temp, not args.no_correction, shutdown_event)
+            elif args.experiment and args.start_temp is not None and args.stop_temp is not None and args.increment is not None:
+                # Run an experiment
+                run_experiment_mode(temp_control, args.start_temp, args.stop_temp, args.increment, args.stab_time, not args.no_correction)
+            else:
+                # Interactive mode (default)
+                interactive_ui = InteractiveUI(temp_control, data_manager)
+                interactive_ui.run(shutdown_event)
+            
     except Exception as e:
         logger.error(f"Error: {e}")
         return 1
     
     finally:
-        # Save data if requested or by default
-        if data_manager.get_all_data():
-            output_file = args.output
-            if not output_file:
-                # Auto-generate filename
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                
-                # Get raw data directory from config
-                raw_data_dir = config.get('paths', 'raw_data_dir', fallback='data/raw')
-                
-                # Ensure directory exists
-                os.makedirs(raw_data_dir, exist_ok=True)
-                
-                # Create filename with relevant information
-                if args.experiment and args.start_temp is not None and args.stop_temp is not None and args.increment is not None:
-                    # For experiments, include temperature range info
-                    filename = f"{timestamp}_{args.start_temp:.1f}_{args.stop_temp:.1f}_{args.increment:.1f}_{args.stab_time}.csv"
-                elif args.set_temp is not None:
-                    # For single temperature, include target temperature
-                    filename = f"{timestamp}_{args.set_temp:.1f}.csv"
-                else:
-                    # Default filename
-                    filename = f"temperature_data_{timestamp}.csv"
-                
-                output_file = os.path.join(raw_data_dir, filename)
-            
-            data_manager.save_to_csv(output_file)
+        # Finish the streamed file, or save the collected data if nothing was streamed
+        streamed_file = data_manager.stop_streaming()
+        if streamed_file and os.path.getsize(streamed_file) == 0:
+            # No data point was recorded
+            os.remove(streamed_file)
+            streamed_file = None
+        
+        if streamed_file or data_manager.get_all_data():
+            if not streamed_file:
+                data_manager.save_to_csv(output_file)
             print(f"\nData saved to {output_file}")
             
-            # Ask if user wants to analyze the data
-            analyze_data = input("\nDo you want to analyze the collected data? (y/n): ")
-            if analyze_data.lower() == 'y':
+            # Ask if user wants to analyze the data (not after an interrupt)
+            if not shutdown_event.is_set() and confirm("\nDo you want to analyze the collected data? (y/n): "):
                 # Get just the filename without the path
                 filename = os.path.basename(output_file)
                 
@@ -181,9 +202,6 @@ def main():
                     # Import the analysis module
                     from analysis.analyze_data import analyze_temperature_data
                     
-                    # Get output directory from config
-                    processed_data_dir = config.get('paths', 'processed_data_dir', fallback='data/processed')
-                    
                     # Analyze the data
                     results = analyze_temperature_data(
                         filename,
@@ -198,8 +216,7 @@ def main():
                         
                         # Ask if user wants to update the correction parameters
                         if 'fitted_params' in results:
-                            update_params = input("\nDo you want to update the correction parameters with the new fit? (y/n): ")
-                            if update_params.lower() == 'y':
+                            if confirm("\nDo you want to update the correction parameters with the new fit? (y/n): "):
                                 # Update the config file
                                 from analysis.fit_parameters import update_config_from_fitted_params
                                 success = update_config_from_fitted_params(results['fitted_params'])
@@ -213,9 +230,6 @@ def main():
                 
                 except Exception as e:
                     print(f"{Colors.RED}Error running analysis: {e}{Colors.RESET}")
-        
-        # Disconnect devices
-        temp_control.disconnect_devices()
     
     return 0
 
@@ -9,9 +9,12 @@ import os
 import sys
 import logging
 import time
-import argparse
-import datetime
+import queue
 import signal
+import threading
+import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Add parent directory to path to allow imports from the package
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -19,10 +22,87 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from thermal_control.devices.tec_controller import TECController
 from thermal_control.devices.arduino_interface import ArduinoInterface
 from thermal_control.core.data_manager import DataManager
-from thermal_control.utils.port_selection import select_ports_interactive, print_available_ports, list_available_ports
+from thermal_control.utils.port_selection import select_ports_interactive
 from thermal_control.utils.logger import setup_logger, get_default_log_file, Colors
+from thermal_control.utils.prompt import confirm
 
-def monitor_temperature(tec_controller, arduino_interface, data_manager, duration=None, interval=1.0):
+log = logging.getLogger(__name__)
+
+# Adaptive sampling: the holder is considered steady when the standard deviation
+# of this many consecutive readings is below the threshold (°C)
+_STEADY_SAMPLES = 10
+_STEADY_STDEV = 0.02
+
+# Set by SIGINT/SIGTERM to stop the monitoring loop
+_STOP = threading.Event()
+
+# Set while the monitoring loop runs; outside it an interrupt aborts the program
+_MONITORING = threading.Event()
+
+def _handle_stop(sig, frame):
+    """Signal handler stopping the monitoring loop, or the program outside of it."""
+    if not _MONITORING.is_set():
+        raise KeyboardInterrupt
+    log.info("Interrupt received, stopping monitoring...")
+    _STOP.set()
+
+signal.signal(signal.SIGINT, _handle_stop)
+signal.signal(signal.SIGTERM, _handle_stop)
+
+# Header of the monitoring table
+_TABLE_HEADER = "\n".join([
+    "\n" + "="*80,
+    "Temperature Monitoring",
+    "="*80,
+    "Time     | Elapsed | Target  | Holder  | Liquid  | Ambient | Sink    | Power",
+    "         | (sec)   | (°C)    | (°C)    | (°C)    | (°C)    | (°C)    | (W)",
+    "-"*80,
+])
+
+# Status row of the monitoring table
+_ROW = (
+    "{time} | {elapsed:7.1f} | "
+    + Colors.CYAN + "{target}" + Colors.RESET + " | "
+    + Colors.GREEN + "{holder}" + Colors.RESET + " | "
+    + Colors.PURPLE + "{liquid}" + Colors.RESET + " | "
+    + Colors.BLUE + "{ambient}" + Colors.RESET + " | "
+    + Colors.RED + "{sink}" + Colors.RESET + " | "
+    + "{power}\n"
+)
+
+def _format_value(value, _format="{:.2f}".format):
+    """Format a reading for the status row."""
+    return _format(value) if value is not None else "N/A"
+
+def _print_rows(row_queue):
+    """
+    Print status rows from a queue until None is received.
+    
+    Args:
+        row_queue: Queue of (time, elapsed, target, holder, liquid, ambient, sink, power) tuples
+    """
+    format_value = _format_value
+    write = sys.stdout.write
+    
+    while True:
+        item = row_queue.get()
+        if item is None:
+            break
+        
+        time_str, elapsed, target_temp, holder_temp, liquid_temp, ambient_temp, sink_temp, power = item
+        write(_ROW.format(
+            time=time_str,
+            elapsed=elapsed,
+            target=format_value(target_temp),
+            holder=format_value(holder_temp),
+            liquid=format_value(liquid_temp),
+            ambient=format_value(ambient_temp),
+            sink=format_value(sink_temp),
+            power=format_value(power)
+        ))
+
+def monitor_temperature(tec_controller, arduino_interface, data_manager, duration=None, interval=1.0,
+                        steady_interval=None):
     """
     Monitor temperatures from TEC controller and Arduino.
     
@@ -32,109 +112,181 @@ def monitor_temperature(tec_controller, arduino_interface, data_manager, duratio
         data_manager: DataManager instance
         duration: Duration in seconds (None for indefinite)
         interval: Reading interval in seconds
+        steady_interval: Reading interval in seconds while the holder temperature
+            is steady (None to always sample at interval)
     """
-    # Initialize
-    start_time = datetime.datetime.now()
+    # Initialize (monotonic clock for elapsed time, wall clock only for timestamps)
+    start_mono = time.monotonic()
+    start_wall = time.time()
     data_manager.reset()
     
-    # Setup stop flag for handling interrupts
-    stop_requested = False
+    # Timestamp strings are only reformatted when the second changes
+    last_second = None
+    timestamp = time_str = None
     
-    def signal_handler(sig, frame):
-        nonlocal stop_requested
-        logging.info("Interrupt received, stopping monitoring...")
-        stop_requested = True
+    # Data point reused on every tick, in CSV column order
+    # (interval_s is the sampling interval that led up to the reading; it changes with steady_interval)
+    row = dict.fromkeys([
+        "timestamp", "elapsed_seconds", "holder_temp", "target_temp",
+        "liquid_temp", "sink_temp", "ambient_temp", "power", "interval_s"
+    ])
     
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Local names for the per-tick calls
+    monotonic = time.monotonic
+    stop_requested = _STOP.is_set
+    wait_for_stop = _STOP.wait
     
     # Print header
-    print("\n" + "="*80)
-    print("Temperature Monitoring")
-    print("="*80)
-    print("Time     | Elapsed | Target  | Holder  | Liquid  | Ambient | Sink    | Power")
-    print("         | (sec)   | (°C)    | (°C)    | (°C)    | (°C)    | (°C)    | (W)")
-    print("-"*80)
+    print(_TABLE_HEADER)
+    
+    # Status rows are formatted and printed on a separate thread, so a slow
+    # terminal cannot stretch the sampling interval
+    row_queue = queue.Queue(maxsize=1024)
+    printer = threading.Thread(target=_print_rows, args=(row_queue,), name="monitor-printer", daemon=True)
+    printer.start()
+    
+    # Arduino reads run on a worker thread so they overlap with the TEC queries
+    # (the TEC queries share one serial link and stay sequential)
+    executor = ThreadPoolExecutor(max_workers=1) if arduino_interface else None
+    
+    # Recent holder readings for adaptive sampling
+    holder_history = deque(maxlen=_STEADY_SAMPLES)
+    last_target = None
+    sample_interval = interval
+    
+    deadline = monotonic()
+    _MONITORING.set()
     
     try:
-        while not stop_requested:
+        while not stop_requested():
             # Get current time
-            current_time = datetime.datetime.now()
-            elapsed = (current_time - start_time).total_seconds()
+            tick = monotonic()
+            elapsed = tick - start_mono
             
             # Check if duration exceeded
             if duration and elapsed > duration:
                 break
             
-            # Read TEC controller data
-            holder_temp = tec_controller.get_object_temperature()
-            target_temp = tec_controller.get_target_temperature()
-            sink_temp = tec_controller.get_sink_temperature()
-            power = tec_controller.calculate_power()
+            second = int(start_wall + elapsed)
+            if second != last_second:
+                timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                time_str = timestamp[11:]
+                last_second = second
+            
+            # Start the Arduino read if available
+            arduino_future = executor.submit(arduino_interface.read_temperatures) if executor else None
             
-            # Read Arduino data if available
+            # Read TEC controller data in one batched exchange (the target is
+            # always read: it is only ever changed from outside this script)
+            tec_data = tec_controller.read_status_bundle()
+            holder_temp = tec_data["holder_temp"]
+            target_temp = tec_data["target_temp"]
+            sink_temp = tec_data["sink_temp"]
+            power = tec_data["power"]
+            
+            # Collect Arduino data
             liquid_temp, ambient_temp = None, None
-            if arduino_interface:
-                liquid_temp, ambient_temp = arduino_interface.read_temperatures()
+            if arduino_future:
+                liquid_temp, ambient_temp = arduino_future.result()
+            
+            # Update data point
+            row["timestamp"] = timestamp
+            row["elapsed_seconds"] = elapsed
+            row["holder_temp"] = holder_temp
+            row["target_temp"] = target_temp
+            row["liquid_temp"] = liquid_temp
+            row["sink_temp"] = sink_temp
+            row["ambient_temp"] = ambient_temp
+            row["power"] = power
+            row["interval_s"] = sample_interval
             
-            # Create data point
-            data_point = {
-                "timestamp": current_time.strftime("%Y-%m-%d %H:%M:%S"),
-                "elapsed_seconds": elapsed,
-                "holder_temp": holder_temp,
-                "target_temp": target_temp,
-                "liquid_temp": liquid_temp,
-                "sink_temp": sink_temp,
-                "ambient_temp": ambient_temp,
-                "power": power
-            }
+            # Add a copy to the data manager (it keeps a reference to each point)
+            data_manager.add_data_point(row.copy())
             
-            # Add to data manager
-            data_manager.add_data_point(data_point)
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("holder=%s target=%s liquid=%s", holder_temp, target_temp, liquid_temp)
             
-            # Format for display
-            def format_value(value):
-                return f"{value:.2f}" if value is not None else "N/A"
+            # Hand the status row to the printer thread
+            try:
+                row_queue.put_nowait((time_str, elapsed, target_temp, holder_temp,
+                                      liquid_temp, ambient_temp, sink_temp, power))
+            except queue.Full:
+                pass  # Terminal is far behind, skip this row on screen (it is still recorded)
             
-            # Print status row with colors
-            time_str = current_time.strftime("%H:%M:%S")
-            print(
-                f"{time_str} | "
-                f"{elapsed:7.1f} | "
-                f"{Colors.CYAN}{format_value(target_temp)}{Colors.RESET} | "
-                f"{Colors.GREEN}{format_value(holder_temp)}{Colors.RESET} | "
-                f"{Colors.PURPLE}{format_value(liquid_temp)}{Colors.RESET} | "
-                f"{Colors.BLUE}{format_value(ambient_temp)}{Colors.RESET} | "
-                f"{Colors.RED}{format_value(sink_temp)}{Colors.RESET} | "
-                f"{format_value(power)}"
-            )
+            if steady_interval:
+                # Sample slowly while the holder is steady, at full rate after a
+                # setpoint change or as soon as it drifts
+                if target_temp != last_target:
+                    holder_history.clear()
+                    last_target = target_temp
+                if holder_temp is not None:
+                    holder_history.append(holder_temp)
+                steady = (len(holder_history) == _STEADY_SAMPLES
+                          and statistics.pstdev(holder_history) < _STEADY_STDEV)
+                new_interval = steady_interval if steady else interval
+                if new_interval != sample_interval:
+                    log.info(f"Sampling interval changed to {new_interval} s at {elapsed:.1f} s "
+                             f"({'holder steady' if steady else 'holder changing'})")
+                    sample_interval = new_interval
             
-            # Wait before next reading (aiming for consistent interval)
-            time_taken = (datetime.datetime.now() - current_time).total_seconds()
-            if time_taken < interval:
-                time.sleep(interval - time_taken)
+            # Wait until the next slot on the sampling grid
+            deadline += sample_interval
+            sleep_for = deadline - monotonic()
+            if sleep_for > 0:
+                # Returns early on interrupt
+                wait_for_stop(sleep_for)
+            else:
+                # Fell behind (slow read), restart the grid from now
+                deadline = monotonic()
             
     except Exception as e:
-        logging.error(f"Error during monitoring: {e}")
+        log.error(f"Error during monitoring: {e}")
     
     finally:
-        logging.info("Monitoring completed")
+        # Interrupts abort the program again, and the next run starts without a stop request
+        _MONITORING.clear()
+        _STOP.clear()
+        
+        if executor:
+            executor.shutdown(wait=False)
+        try:
+            row_queue.put(None, timeout=1.0)
+            printer.join(timeout=1.0)
+        except queue.Full:
+            pass
+        log.info("Monitoring completed")
 
 def main():
     """Main function."""
+    import argparse
+    import datetime
+    
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="Temperature Monitoring System")
     parser.add_argument("--tec-port", help="Serial port for TEC controller")
     parser.add_argument("--arduino-port", help="Serial port for Arduino")
     parser.add_argument("--duration", type=int, default=None, help="Monitoring duration in seconds")
     parser.add_argument("--interval", type=float, default=1.0, help="Reading interval in seconds")
+    parser.add_argument("--steady-interval", type=float, default=None,
+                        help="Reading interval in seconds while the holder temperature is steady "
+                             "(e.g. 5; default: always use --interval)")
     parser.add_argument("--output", help="Output file for data")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                        help="Output file format (parquet needs pyarrow, smaller and faster to load for long runs, "
+                             "but unreadable if the program is killed or crashes; csv keeps every flushed row)")
+    parser.add_argument("--flush-every", type=int, default=None,
+                        help="Number of readings buffered before the output file is flushed to disk "
+                             "(default: 30 for csv, 600 for parquet)")
     parser.add_argument("--log-file", help="Log file path")
     parser.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
                         default="INFO", help="Logging level")
+    parser.add_argument("--yes", "-y", action="store_true", help="Proceed without asking to confirm the settings")
     
     args = parser.parse_args()
     
+    # Flush each status row as it is written, also when output is redirected
+    sys.stdout.reconfigure(line_buffering=True)
+    
     # Set up logging
     log_file = args.log_file or get_default_log_file()
     setup_logger(log_file=log_file, level=getattr(logging, args.log_level))
@@ -149,9 +301,9 @@ def main():
     
     if not tec_port or not arduino_port:
         try:
-            tec_port, arduino_port = select_ports_interactive()
+            tec_port, arduino_port = select_ports_interactive(tec_port, arduino_port, assume_yes=args.yes)
         except Exception as e:
-            logging.error(f"Error selecting ports: {e}")
+            log.error(f"Error selecting ports: {e}")
             return 1
     
     # Print monitoring settings
@@ -163,10 +315,11 @@ def main():
         print("  Arduino: Not used")
     print(f"  Duration: {args.duration if args.duration else 'Indefinite'} seconds")
     print(f"  Interval: {args.interval} seconds")
+    if args.steady_interval:
+        print(f"  Steady interval: {args.steady_interval} seconds")
     
     # Confirm before proceeding
-    confirm = input("\nProceed with these settings? (y/n): ")
-    if confirm.lower() != 'y':
+    if not confirm("\nProceed with these settings? (y/n): ", assume_yes=args.yes):
         print("Monitoring cancelled.")
         return 0
     
@@ -176,40 +329,50 @@ def main():
     data_manager = DataManager()
     
     try:
+        # Choose the output file and create its directory before the (slower) device connects
+        output_file = args.output
+        if not output_file:
+            # Auto-generate filename
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"data/temperature_monitor_{timestamp}.{args.format}"
+        
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        
         # Connect to TEC controller
         if not tec_controller.connect():
-            logging.error("Failed to connect to TEC controller. Exiting.")
+            log.error("Failed to connect to TEC controller. Exiting.")
             return 1
         
         # Connect to Arduino if specified
         if arduino_interface and not arduino_interface.connect():
-            logging.warning("Failed to connect to Arduino. Continuing with TEC controller only.")
+            log.warning("Failed to connect to Arduino. Continuing with TEC controller only.")
             arduino_interface = None
         
+        # Stream data to the output file while monitoring
+        flush_every = args.flush_every or (600 if args.format == "parquet" else 30)
+        output_file = data_manager.start_streaming(output_file, flush_every=flush_every,
+                                                   file_format=args.format)
+        
         # Run monitoring
         monitor_temperature(
             tec_controller,
             arduino_interface,
             data_manager,
             duration=args.duration,
-            interval=args.interval
+            interval=args.interval,
+            steady_interval=args.steady_interval
         )
         
-        # Save data
-        output_file = args.output
-        if not output_file:
-            # Auto-generate filename
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"data/temperature_monitor_{timestamp}.csv"
-        
-        data_manager.save_to_csv(output_file)
-        print(f"\nData saved to {output_file}")
+        if data_manager.stop_streaming():
+            print(f"\nData saved to {output_file}")
         
     except Exception as e:
-        logging.error(f"Error: {e}")
+        log.error(f"Error: {e}")
         return 1
     
     finally:
+        data_manager.stop_streaming()
+        
         # Disconnect devices
         if tec_controller:
             tec_controller.disconnect()
@@ -219,4 +382,8 @@ def main():
     return 0
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\nMonitoring cancelled.")
+        sys.exit(130)
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Tests for the prompt helpers."""
+
+import builtins
+import io
+import queue
+import threading
+
+import pytest
+
+from thermal_control.utils import prompt
+
+
+@pytest.fixture(autouse=True)
+def fresh_reader(monkeypatch):
+    monkeypatch.setattr(prompt, "_input_thread", None)
+    monkeypatch.setattr(prompt, "_input_lines", queue.Queue())
+
+
+class _StdinNotRead(io.StringIO):
+    def readline(self, *args):
+        raise AssertionError("stdin read while an input() reader is pending")
+
+
+def test_confirm_takes_answer_from_pending_reader(monkeypatch):
+    typed = threading.Event()
+    
+    def blocking_input(text=""):
+        typed.wait(5)
+        return "y"
+    
+    monkeypatch.setattr(builtins, "input", blocking_input)
+    monkeypatch.setattr(prompt.sys, "stdin", _StdinNotRead())
+    
+    # The command prompt is stopped while the user is still typing
+    stop_event = threading.Event()
+    stop_event.set()
+    assert prompt._input_until("> ", stop_event, 0.01) is None
+    assert prompt._input_thread.is_alive()
+    
+    threading.Timer(0.1, typed.set).start()
+    assert prompt.confirm("Analyze? (y/n): ") is True
+
+
+def test_confirm_reads_stdin_without_pending_reader(monkeypatch):
+    monkeypatch.setattr(prompt.sys, "stdin", io.StringIO("n\n\n"))
+    assert prompt.confirm("Proceed? (y/n): ", default=True) is False
+    # Empty answer, then end of input
+    assert prompt.confirm("Proceed? (y/n): ", default=True) is True
+    assert prompt.confirm("Proceed? (y/n): ") is False
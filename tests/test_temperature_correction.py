@@ -0,0 +1,49 @@
+"""Tests for the vectorized temperature correction."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from thermal_control.core.temperature_control import TemperatureControl
+
+
+def make_control(a, b, c):
+    control = TemperatureControl(None, None, None)
+    control.a, control.b, control.c = a, b, c
+    return control
+
+
+def scalar_targets(control, temps):
+    return np.array([control.calculate_corrected_target(t) for t in temps])
+
+
+def test_matches_scalar_with_default_coefficients():
+    control = TemperatureControl(None, None, None)
+    temps = [5.0, 20.0, 37.5, 60.0]
+    np.testing.assert_allclose(control.calculate_corrected_targets(temps), scalar_targets(control, temps))
+
+
+def test_zero_quadratic_coefficient_falls_back_to_desired_temperature():
+    control = make_control(0.0, 0.5645, 4.8536)
+    temps = [10.0, 25.0, 40.0]
+    targets = control.calculate_corrected_targets(temps)
+    assert np.all(np.isfinite(targets))
+    np.testing.assert_allclose(targets, scalar_targets(control, temps))
+    np.testing.assert_allclose(targets, temps)
+
+
+def test_negative_discriminant_uses_linear_approximation():
+    control = make_control(0.0039, 0.5645, 4.8536)
+    # b**2 - 4a(c - y) < 0 for temperatures well below c - b**2/(4a)
+    temps = [-20.0, -50.0, 25.0]
+    targets = control.calculate_corrected_targets(temps)
+    assert np.all(np.isfinite(targets))
+    np.testing.assert_allclose(targets, scalar_targets(control, temps))
+
+
+def test_no_solution_at_all_falls_back_to_desired_temperature():
+    control = make_control(0.0039, 0.0, 4.8536)
+    temps = [0.0, 4.0]
+    targets = control.calculate_corrected_targets(temps)
+    np.testing.assert_allclose(targets, scalar_targets(control, temps))
+    np.testing.assert_allclose(targets, temps)
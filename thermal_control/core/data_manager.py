@@ -9,9 +9,15 @@ import os
 import csv
 import logging
 import datetime
+import operator
+import queue
 import threading
+import time
 from collections import deque
 
+# Queued in place of a data point to tell the writer thread to finish
+_END_OF_STREAM = object()
+
 class DataManager:
     """Manages temperature data collection and storage."""
     
@@ -25,12 +31,36 @@ class DataManager:
         self.data = deque(maxlen=max_points)
         self.data_lock = threading.Lock()
         self.start_time = None
+        self.start_monotonic = None
+        
+        # Number of the current data collection session, counted up by reset()
+        # and recorded with every point, so sessions in one streamed file can be told apart
+        self.session = 0
+        
+        # Timestamp string of the last added point, reused within the same second
+        self._last_second = None
+        self._last_timestamp = None
+        
+        # Optional CSV file that every new data point is written to
+        # (by a background thread fed through stream_queue)
+        self.stream_queue = None
+        self.stream_thread = None
+        self.stream_filename = None
     
     def reset(self):
-        """Reset data collection."""
+        """
+        Reset data collection.
+        
+        Starts a new session (see the session column). While streaming, the
+        elapsed time keeps counting from the start of the stream, so the
+        streamed file stays one continuous time series.
+        """
         with self.data_lock:
             self.data.clear()
-            self.start_time = datetime.datetime.now()
+            self.session += 1
+            if self.stream_queue is None or self.start_monotonic is None:
+                self.start_time = datetime.datetime.now()
+                self.start_monotonic = time.monotonic()
 
     def add_data_point(self, data_point):
         """
@@ -42,17 +72,254 @@ class DataManager:
         # Initialize start time if not set
         if self.start_time is None:
             self.start_time = datetime.datetime.now()
+            self.start_monotonic = time.monotonic()
         
         # Add timestamp and elapsed time if not present
         if 'timestamp' not in data_point:
-            data_point['timestamp'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            second = int(time.time())
+            if second != self._last_second:
+                self._last_timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                self._last_second = second
+            data_point['timestamp'] = self._last_timestamp
         
-        if 'elapsed_seconds' not in data_point and self.start_time:
-            elapsed = (datetime.datetime.now() - self.start_time).total_seconds()
-            data_point['elapsed_seconds'] = elapsed
+        if 'elapsed_seconds' not in data_point:
+            data_point['elapsed_seconds'] = time.monotonic() - self.start_monotonic
+        
+        if 'session' not in data_point:
+            data_point['session'] = self.session
         
         with self.data_lock:
             self.data.append(data_point)
+            
+            stream_queue = self.stream_queue
+            if stream_queue is not None and not self.stream_thread.is_alive():
+                # The writer stopped after an error (logged by it), stop queuing points for it
+                logging.error(f"Data writer stopped, no longer streaming to {self.stream_filename}")
+                stream_queue = self.stream_queue = None
+        
+        if stream_queue is not None:
+            try:
+                stream_queue.put_nowait(data_point)
+            except queue.Full:
+                logging.warning("Data writer is falling behind, data point not streamed")
+    
+    def start_streaming(self, filename, flush_every=30, max_queued=1000, file_format=None):
+        """
+        Write every new data point directly to a CSV or Parquet file.
+        
+        Unlike save_to_csv, the file keeps all points of a long run, not only
+        the ones still held in memory. Rows are written by a background thread,
+        so add_data_point never waits for the disk.
+        
+        Parquet output needs pyarrow; without it the data is streamed to a CSV
+        file of the same name instead. A Parquet file is not crash-safe: its
+        footer is only written by stop_streaming, so if the process is killed
+        first the file cannot be read at all (a CSV file keeps every flushed row).
+        
+        Args:
+            filename: Output file path
+            flush_every: Number of points between flushes to disk (for Parquet,
+                each flush writes one row group)
+            max_queued: Maximum number of points waiting to be written
+            file_format: 'csv' or 'parquet' (from the file extension if None)
+            
+        Returns:
+            Path to the output file
+        """
+        if file_format is None:
+            file_format = 'parquet' if filename.endswith('.parquet') else 'csv'
+        
+        if file_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                filename = os.path.splitext(filename)[0] + '.csv'
+                logging.warning(f"pyarrow not installed, streaming data as CSV to {filename}")
+                file_format = 'csv'
+        
+        # Ensure directory exists
+        os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else ".", exist_ok=True)
+        
+        self.stop_streaming()
+        
+        stream_queue = queue.Queue(maxsize=max_queued)
+        if file_format == 'parquet':
+            target, output = self._parquet_stream_worker, filename
+        else:
+            target, output = self._stream_worker, open(filename, 'w', newline='', buffering=65536)
+        thread = threading.Thread(
+            target=target,
+            args=(output, stream_queue, max(1, flush_every)),
+            name="data-writer",
+            daemon=True
+        )
+        thread.start()
+        
+        with self.data_lock:
+            self.stream_queue = stream_queue
+            self.stream_thread = thread
+            self.stream_filename = filename
+            
+            # Elapsed times in the file count from the start of the stream
+            self.start_time = datetime.datetime.now()
+            self.start_monotonic = time.monotonic()
+        
+        logging.info(f"Streaming data to {filename}")
+        return filename
+    
+    def stop_streaming(self, timeout=5.0):
+        """
+        Write the remaining queued points and close the streaming file.
+        
+        Args:
+            timeout: Maximum time in seconds to wait for the writer thread
+            
+        Returns:
+            Path to the streamed file, or None if streaming was not active
+        """
+        with self.data_lock:
+            stream_queue, thread, filename = self.stream_queue, self.stream_thread, self.stream_filename
+            self.stream_queue = None
+            self.stream_thread = None
+            self.stream_filename = None
+        
+        if thread is None:
+            return None
+        
+        # A writer that stopped after an error no longer empties the queue
+        if stream_queue is not None and thread.is_alive():
+            deadline = time.monotonic() + timeout
+            try:
+                stream_queue.put(_END_OF_STREAM, timeout=timeout)
+            except queue.Full:
+                pass
+            thread.join(max(0.0, deadline - time.monotonic()))
+            if thread.is_alive():
+                logging.warning(f"Timed out writing remaining data to {filename}")
+        
+        return filename
+    
+    @staticmethod
+    def _next_batch(stream_queue):
+        """
+        Wait for a queued data point, then take whatever else is already queued.
+        
+        Args:
+            stream_queue: Queue of data points
+            
+        Returns:
+            Tuple of (list of data points, whether the end of stream was reached)
+        """
+        batch = []
+        item = stream_queue.get()
+        while item is not _END_OF_STREAM:
+            batch.append(item)
+            try:
+                item = stream_queue.get_nowait()
+            except queue.Empty:
+                return batch, False
+        return batch, True
+    
+    @staticmethod
+    def _csv_rows(data_points, fieldnames, row_values):
+        """
+        Arrange data points as CSV rows.
+        
+        Args:
+            data_points: Data points to convert
+            fieldnames: Column names in output order
+            row_values: operator.itemgetter for fieldnames
+            
+        Returns:
+            List of rows
+        """
+        rows = []
+        for data_point in data_points:
+            try:
+                rows.append(row_values(data_point))
+            except KeyError:
+                # Point without some of the columns, leave them empty
+                rows.append([data_point.get(key) for key in fieldnames])
+        return rows
+    
+    def _stream_worker(self, csvfile, stream_queue, flush_every):
+        """
+        Write queued data points to the streaming CSV file until end of stream.
+        
+        Args:
+            csvfile: Open output file
+            stream_queue: Queue of data points
+            flush_every: Number of points between flushes to disk
+        """
+        writer = None
+        unflushed = 0
+        done = False
+        
+        try:
+            while not done:
+                batch, done = self._next_batch(stream_queue)
+                if not batch:
+                    continue
+                
+                if writer is None:
+                    # Determine fieldnames from the first data point
+                    fieldnames = list(batch[0].keys())
+                    row_values = operator.itemgetter(*fieldnames)
+                    writer = csv.writer(csvfile)
+                    writer.writerow(fieldnames)
+                
+                writer.writerows(self._csv_rows(batch, fieldnames, row_values))
+                
+                unflushed += len(batch)
+                if unflushed >= flush_every:
+                    csvfile.flush()
+                    unflushed = 0
+        except Exception as e:
+            logging.error(f"Error writing data to {csvfile.name}: {e}")
+        finally:
+            csvfile.close()
+    
+    def _parquet_stream_worker(self, filename, stream_queue, flush_every):
+        """
+        Write queued data points to a Parquet file until end of stream.
+        
+        The file only becomes readable when the writer is closed at the end of
+        the stream; see start_streaming.
+        
+        Args:
+            filename: Output file path
+            stream_queue: Queue of data points
+            flush_every: Number of points per row group
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        writer = None
+        pending = []
+        done = False
+        
+        try:
+            while not done:
+                batch, done = self._next_batch(stream_queue)
+                pending.extend(batch)
+                if not pending or (len(pending) < flush_every and not done):
+                    continue
+                
+                if writer is None:
+                    # Column types from the first data point: text stays text, readings are float
+                    schema = pa.schema([
+                        (key, pa.string() if isinstance(value, str) else pa.float64())
+                        for key, value in pending[0].items()
+                    ])
+                    writer = pq.ParquetWriter(filename, schema)
+                
+                writer.write_table(pa.Table.from_pylist(pending, schema=schema))
+                pending = []
+        except Exception as e:
+            logging.error(f"Error writing data to {filename}: {e}")
+        finally:
+            if writer is not None:
+                writer.close()
     
     def get_latest_data(self):
         """Get the latest data point."""
@@ -66,6 +333,51 @@ class DataManager:
         with self.data_lock:
             return list(self.data)
     
+    def get_column_arrays(self, fields=None, last_seconds=None):
+        """
+        Get collected data as one numpy array per column.
+        
+        Lets scripts compute statistics on the in-memory data directly,
+        without a round trip through the CSV file.
+        
+        Args:
+            fields: Column names to return (all numeric columns if None)
+            last_seconds: Only include the points of this many seconds before
+                the newest one (all points if None)
+            
+        Returns:
+            Dict mapping column names to float arrays (missing readings are NaN),
+            empty if there is no data
+        """
+        import numpy as np
+        
+        with self.data_lock:
+            if not self.data:
+                return {}
+            
+            if last_seconds and len(self.data) > 1:
+                # Points are in time order, so walk back from the newest one
+                # and stop at the start of the window instead of scanning all of them
+                threshold = self.data[-1].get('elapsed_seconds', 0) - last_seconds
+                data_points = []
+                for d in reversed(self.data):
+                    if d.get('elapsed_seconds', float('inf')) < threshold:
+                        break
+                    data_points.append(d)
+            else:
+                data_points = list(self.data)
+        
+        if fields is None:
+            fields = [key for key, value in data_points[0].items() if not isinstance(value, str)]
+        
+        arrays = {}
+        for field in fields:
+            values = (data_point.get(field) for data_point in data_points)
+            arrays[field] = np.fromiter((np.nan if value is None else value for value in values),
+                                        dtype=np.float64, count=len(data_points))
+        
+        return arrays
+    
     def save_to_csv(self, filename=None):
         """
         Save collected data to a CSV file.
@@ -84,27 +396,39 @@ class DataManager:
         # Ensure directory exists
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else ".", exist_ok=True)
         
+        # Copy the points under the lock, so the sampling loop is not held up while writing
         with self.data_lock:
-            if not self.data:
-                logging.warning("No data to save")
-                return None
+            data = list(self.data)
+        
+        if not data:
+            logging.warning("No data to save")
+            return None
+        
+        try:
+            # Determine fieldnames from the first data point
+            fieldnames = list(data[0].keys())
             
             try:
-                # Determine fieldnames from the first data point
-                fieldnames = list(self.data[0].keys())
-                
-                with open(filename, 'w', newline='') as csvfile:
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for data_point in self.data:
-                        writer.writerow(data_point)
-                
-                logging.info(f"Data saved to {filename}")
-                return filename
-                
-            except Exception as e:
-                logging.error(f"Error saving data to {filename}: {e}")
-                return None
+                import pandas as pd
+            except ImportError:
+                pd = None
+            
+            if pd is not None:
+                # Let pandas format and write all rows in one call
+                df = pd.DataFrame.from_records(data, columns=fieldnames)
+                df.to_csv(filename, index=False)
+            else:
+                with open(filename, 'w', newline='', buffering=65536) as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(fieldnames)
+                    writer.writerows(self._csv_rows(data, fieldnames, operator.itemgetter(*fieldnames)))
+            
+            logging.info(f"Data saved to {filename}")
+            return filename
+            
+        except Exception as e:
+            logging.error(f"Error saving data to {filename}: {e}")
+            return None
     
     def get_summary_statistics(self, period='all'):
         """
@@ -116,50 +440,30 @@ class DataManager:
         Returns:
             Dictionary of statistics
         """
-        with self.data_lock:
-            if not self.data:
-                return None
-            
-            # Filter data based on period
-            filtered_data = self.data
-            
-            if period != 'all' and len(self.data) > 1:
-                now = datetime.datetime.now()
-                
-                if period == 'last_minute':
-                    cutoff = 60  # seconds
-                elif period == 'last_5_minutes':
-                    cutoff = 300  # seconds
-                elif period == 'last_hour':
-                    cutoff = 3600  # seconds
-                else:
-                    cutoff = None
-                
-                if cutoff:
-                    filtered_data = [
-                        d for d in self.data 
-                        if d.get('elapsed_seconds', float('inf')) >= (self.data[-1].get('elapsed_seconds', 0) - cutoff)
-                    ]
-            
-            # Calculate statistics
-            stats = {}
-            
-            # Calculate for each temperature field
-            for field in ['holder_temp', 'liquid_temp', 'ambient_temp', 'sink_temp']:
-                # Get values, excluding None
-                values = [d.get(field) for d in filtered_data if d.get(field) is not None]
-                
-                if values:
-                    stats[f"{field}_mean"] = sum(values) / len(values)
-                    stats[f"{field}_min"] = min(values)
-                    stats[f"{field}_max"] = max(values)
-                    stats[f"{field}_range"] = stats[f"{field}_max"] - stats[f"{field}_min"]
-                    # Standard deviation
-                    if len(values) > 1:
-                        mean = stats[f"{field}_mean"]
-                        variance = sum((x - mean) ** 2 for x in values) / len(values)
-                        stats[f"{field}_std"] = variance ** 0.5
-                    else:
-                        stats[f"{field}_std"] = 0
+        import numpy as np
+        
+        # Time window of each period in seconds
+        cutoff = {'last_minute': 60, 'last_5_minutes': 300, 'last_hour': 3600}.get(period)
+        
+        columns = self.get_column_arrays(['holder_temp', 'liquid_temp', 'ambient_temp', 'sink_temp'],
+                                         last_seconds=cutoff)
+        if not columns:
+            return None
+        
+        # Calculate statistics
+        stats = {}
+        
+        # Calculate for each temperature field
+        for field, column in columns.items():
+            # Leave out missing readings
+            values = column[~np.isnan(column)]
             
-            return stats
\ No newline at end of file
+            if values.size:
+                stats[f"{field}_mean"] = float(values.mean())
+                stats[f"{field}_min"] = float(values.min())
+                stats[f"{field}_max"] = float(values.max())
+                stats[f"{field}_range"] = stats[f"{field}_max"] - stats[f"{field}_min"]
+                # Population standard deviation (0 for a single value)
+                stats[f"{field}_std"] = float(values.std())
+        
+        return stats
@@ -5,15 +5,26 @@ Temperature Control System
 This module provides the core temperature control logic.
 """
 
+import math
 import logging
 import time
 import threading
 import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Readings included in the periodic status log line: (label, data point key, unit)
+_STATUS_FIELDS = (
+    ("Holder", "holder_temp", "°C"),
+    ("Liquid", "liquid_temp", "°C"),
+    ("Ambient", "ambient_temp", "°C"),
+    ("Power", "power", "W"),
+    ("Target", "target_temp", "°C"),
+)
 
 class TemperatureControl:
     """Main class for temperature control system with offset correction."""
     
-    def __init__(self, tec_controller, arduino_interface, data_manager):
+    def __init__(self, tec_controller, arduino_interface, data_manager, shutdown_event=None):
         """
         Initialize the temperature control system.
         
@@ -21,6 +32,8 @@ class TemperatureControl:
             tec_controller: TECController instance
             arduino_interface: ArduinoInterface instance
             data_manager: DataManager instance
+            shutdown_event: Optional threading.Event set when the program should stop
+                (e.g. by a signal handler); ends a running experiment
         """
         self.tec = tec_controller
         self.arduino = arduino_interface
@@ -28,8 +41,13 @@ class TemperatureControl:
         self.running = False
         self.experiment_running = False
         self.stop_event = threading.Event()
+        self.shutdown_event = shutdown_event
+        self.experiment_stop_event = threading.Event()  # Wakes an experiment out of its stabilization wait
         self.desired_liquid_temp = None
         
+        # Worker thread for Arduino reads, created on first use
+        self.arduino_executor = None
+        
         # Coefficients for temperature correction formula from LabVIEW:
         # x = (-0.5645 + sqrt(0.5645**2 - 4*0.0039*(4.8536-y)))/(2*0.0039)
         # Where y is the desired liquid temperature and x is the corrected target temperature
@@ -45,6 +63,7 @@ class TemperatureControl:
         # New interpolation support
         self.use_interpolation = False  # Whether to use interpolation model instead of polynomial
         self.interp_data = None  # Interpolation data
+        self._interp_cache = (None, None)  # (interp_data it was built from, offset interpolation function)
     
     def connect_devices(self):
         """Connect to both devices."""
@@ -66,8 +85,18 @@ class TemperatureControl:
                 logging.error("Failed to connect to Arduino")
             return False
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Disconnect from both devices."""
+        self.disconnect_devices()
+    
     def disconnect_devices(self):
         """Disconnect from both devices."""
+        if self.arduino_executor:
+            self.arduino_executor.shutdown(wait=True)
+            self.arduino_executor = None
         if self.tec:
             self.tec.disconnect()
         if self.arduino:
@@ -130,11 +159,12 @@ class TemperatureControl:
             else:
                 # Use quadratic formula, taking the positive square root solution
                 # This is based on the LabVIEW formula that uses the + sign
-                corrected_target = (-self.b + (discriminant)**0.5) / (2 * self.a)
+                root = math.sqrt(discriminant)
+                corrected_target = (-self.b + root) / (2 * self.a)
                 
                 # If result is unreasonably outside the operating range, try other solution
                 if corrected_target < 0 or corrected_target > 100:
-                    alt_target = (-self.b - (discriminant)**0.5) / (2 * self.a)
+                    alt_target = (-self.b - root) / (2 * self.a)
                     if 0 <= alt_target <= 100:
                         logging.info(f"Using alternative solution {alt_target:.2f}°C instead of {corrected_target:.2f}°C")
                         corrected_target = alt_target
@@ -161,9 +191,6 @@ class TemperatureControl:
         Returns:
             Corrected target temperature for the holder
         """
-        from scipy.interpolate import interp1d
-        import numpy as np
-        
         # Apply ambient temperature correction if enabled and ambient_temp is provided
         ambient_correction = 0.0
         if self.use_ambient_correction and ambient_temp is not None:
@@ -179,14 +206,13 @@ class TemperatureControl:
                 logging.warning("Interpolation data not available, falling back to polynomial correction")
                 return self.calculate_corrected_target_poly(desired_liquid_temp, ambient_temp)
             
-            # Get interpolation data
-            target_temps = np.array(self.interp_data['target_temps'])
-            liquid_offsets = np.array(self.interp_data['liquid_offsets'])
-            kind = self.interp_data.get('interp_kind', 'linear')
-            
             # Check if we're within the interpolation range
-            temp_min = self.interp_data.get('temp_min', float(np.min(target_temps)))
-            temp_max = self.interp_data.get('temp_max', float(np.max(target_temps)))
+            temp_min = self.interp_data.get('temp_min')
+            if temp_min is None:
+                temp_min = float(min(self.interp_data['target_temps']))
+            temp_max = self.interp_data.get('temp_max')
+            if temp_max is None:
+                temp_max = float(max(self.interp_data['target_temps']))
             
             # Warn if extrapolating
             if adjusted_desired_temp < temp_min:
@@ -196,12 +222,8 @@ class TemperatureControl:
                 logging.warning(f"Desired temperature {adjusted_desired_temp:.2f}°C is above the "
                                f"interpolation range ({temp_max:.2f}°C). Using extrapolation.")
             
-            # Create interpolation function
-            interp_func = interp1d(target_temps, liquid_offsets, kind=kind, 
-                                   bounds_error=False, fill_value='extrapolate')
-            
             # Get interpolated offset
-            interpolated_offset = float(interp_func(adjusted_desired_temp))
+            interpolated_offset = float(self._offset_interpolator()(adjusted_desired_temp))
             
             # Calculate corrected target temperature
             # If the offset is positive, the liquid is warmer than target, so we need to set holder cooler
@@ -220,6 +242,27 @@ class TemperatureControl:
             logging.warning("Falling back to polynomial correction due to error")
             return self.calculate_corrected_target_poly(desired_liquid_temp, ambient_temp)
     
+    def _offset_interpolator(self):
+        """
+        Get the liquid offset interpolation function of the loaded model.
+        
+        The function is built on first use and reused until interp_data is replaced.
+        
+        Returns:
+            scipy interp1d function mapping target temperatures to liquid offsets
+        """
+        source, interp_func = self._interp_cache
+        if interp_func is None or source is not self.interp_data:
+            from scipy.interpolate import interp1d
+            import numpy as np
+            
+            interp_func = interp1d(np.asarray(self.interp_data['target_temps'], dtype=float),
+                                   np.asarray(self.interp_data['liquid_offsets'], dtype=float),
+                                   kind=self.interp_data.get('interp_kind', 'linear'),
+                                   bounds_error=False, fill_value='extrapolate')
+            self._interp_cache = (self.interp_data, interp_func)
+        return interp_func
+    
     def calculate_corrected_target(self, desired_liquid_temp, ambient_temp=None):
         """
         Calculate the corrected target temperature for the holder.
@@ -243,28 +286,104 @@ class TemperatureControl:
             return self.calculate_corrected_target_interp(desired_liquid_temp, ambient_temp)
         else:
             return self.calculate_corrected_target_poly(desired_liquid_temp, ambient_temp)
-    
+
+    def calculate_corrected_targets(self, desired_liquid_temps, ambient_temp=None):
+        """
+        Calculate corrected holder targets for an array of desired liquid temperatures.
+
+        Vectorized counterpart of calculate_corrected_target for batch use
+        (e.g. planning a calibration sweep). Applies the same correction model,
+        root selection and fallbacks as the scalar version, without per-value logging:
+        interpolation falls back to the polynomial, and where the polynomial has
+        no usable solution the desired temperature itself is returned.
+
+        Args:
+            desired_liquid_temps: Sequence or array of desired liquid temperatures
+            ambient_temp: Optional ambient temperature for additional compensation
+
+        Returns:
+            numpy array of corrected target temperatures for the holder
+        """
+        import numpy as np
+
+        temps = np.asarray(desired_liquid_temps, dtype=float)
+
+        ambient_correction = 0.0
+        if self.use_ambient_correction and ambient_temp is not None:
+            ambient_correction = self.ambient_coefficient * (ambient_temp - self.ambient_reference)
+        adjusted = temps - ambient_correction
+
+        corrected = self._poly_targets(temps, adjusted)
+
+        if (self.use_interpolation and self.interp_data is not None
+                and 'target_temps' in self.interp_data and 'liquid_offsets' in self.interp_data):
+            try:
+                interpolated = adjusted - self._offset_interpolator()(adjusted)
+                corrected = np.where(np.isfinite(interpolated), interpolated, corrected)
+            except Exception as e:
+                logging.error(f"Error calculating corrected temperatures using interpolation: {e}")
+                logging.warning("Falling back to polynomial correction due to error")
+
+        return corrected
+
+    def _poly_targets(self, temps, adjusted):
+        """
+        Polynomial correction for an array of temperatures.
+
+        Args:
+            temps: Array of desired liquid temperatures
+            adjusted: The same temperatures after ambient correction
+
+        Returns:
+            numpy array of corrected targets, the desired temperature where there is no solution
+        """
+        import numpy as np
+
+        # Same failures as the scalar version, which falls back to the desired temperature
+        if self.a == 0:
+            return temps.copy()
+
+        with np.errstate(all='ignore'):
+            discriminant = self.b**2 - 4 * self.a * (self.c - adjusted)
+            root = np.sqrt(discriminant)
+            corrected = (-self.b + root) / (2 * self.a)
+            alt = (-self.b - root) / (2 * self.a)
+
+            # Same root selection as the scalar version
+            use_alt = ((corrected < 0) | (corrected > 100)) & (alt >= 0) & (alt <= 100)
+            corrected = np.where(use_alt, alt, corrected)
+
+            # Linear approximation where there is no real solution
+            if self.b != 0:
+                corrected = np.where(discriminant < 0, (adjusted - self.c) / self.b, corrected)
+
+        return np.where(np.isfinite(corrected), corrected, temps)
+
     def read_all_sensors(self):
         """Read data from all sensors."""
-        # Read TEC controller values
-        holder_temp = self.tec.get_object_temperature()
-        target_temp = self.tec.get_target_temperature()
-        sink_temp = self.tec.get_sink_temperature()
-        power = self.tec.calculate_power()
+        # Start the Arduino read (if available) so it overlaps with the TEC queries
+        arduino_future = None
+        if self.arduino:
+            if self.arduino_executor is None:
+                self.arduino_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arduino")
+            arduino_future = self.arduino_executor.submit(self.arduino.read_temperatures)
         
-        # Read Arduino values (if available)
+        # Read TEC controller values in one batched exchange
+        tec_data = self.tec.read_status_bundle()
+        
+        # Collect Arduino values
         liquid_temp, ambient_temp = None, None
-        if self.arduino:
-            liquid_temp, ambient_temp = self.arduino.read_temperatures()
+        if arduino_future:
+            liquid_temp, ambient_temp = arduino_future.result()
         
         # Create data point
         data_point = {
-            "holder_temp": holder_temp,
-            "target_temp": target_temp,
+            "holder_temp": tec_data["holder_temp"],
+            "target_temp": tec_data["target_temp"],
             "liquid_temp": liquid_temp,
-            "sink_temp": sink_temp,
+            "sink_temp": tec_data["sink_temp"],
             "ambient_temp": ambient_temp,
-            "power": power,
+            "power": tec_data["power"],
             "desired_liquid_temp": self.desired_liquid_temp
         }
         
@@ -287,6 +406,7 @@ class TemperatureControl:
         """Stop the monitoring loop."""
         if self.running:
             self.stop_event.set()
+            self.experiment_stop_event.set()
             self.running = False
             if hasattr(self, 'monitor_thread'):
                 self.monitor_thread.join(timeout=2)
@@ -298,6 +418,10 @@ class TemperatureControl:
         """Main monitoring loop that reads sensors and logs data."""
         logging.info("Monitoring loop started")
         
+        # Readings are taken on a fixed 1 s grid of the monotonic clock
+        interval = 1.0
+        deadline = time.monotonic()
+        
         while not self.stop_event.is_set():
             try:
                 # Read all sensors
@@ -306,34 +430,35 @@ class TemperatureControl:
                 # Add data point to the data manager
                 self.data_manager.add_data_point(data_point)
                 
-                # Print current status (with checks for None values)
-                status = "Current status: "
-                if data_point["holder_temp"] is not None:
-                    status += f"Holder: {data_point['holder_temp']:.2f}°C, "
-                if data_point["liquid_temp"] is not None:
-                    status += f"Liquid: {data_point['liquid_temp']:.2f}°C, "
-                if data_point["ambient_temp"] is not None:
-                    status += f"Ambient: {data_point['ambient_temp']:.2f}°C, "
-                if data_point["power"] is not None:
-                    status += f"Power: {data_point['power']:.2f}W, "
-                if data_point["target_temp"] is not None:
-                    status += f"Target: {data_point['target_temp']:.2f}°C"
-                
-                logging.info(status)
+                # Print current status (skipping unavailable values)
+                if logging.getLogger().isEnabledFor(logging.INFO):
+                    logging.info("Current status: " + ", ".join(
+                        f"{label}: {data_point[key]:.2f}{unit}"
+                        for label, key, unit in _STATUS_FIELDS
+                        if data_point[key] is not None
+                    ))
                 
             except Exception as e:
                 logging.error(f"Error in monitoring loop: {e}")
             
-            # Wait before next reading
-            time.sleep(1)
+            # Wait until the next reading is due (returns early when stopped)
+            deadline += interval
+            sleep_for = deadline - time.monotonic()
+            if sleep_for > 0:
+                self.stop_event.wait(sleep_for)
+            else:
+                # Fell behind, restart the grid from now
+                deadline = time.monotonic()
     
-    def set_temperature(self, desired_liquid_temp, use_correction=True):
+    def set_temperature(self, desired_liquid_temp, use_correction=True, corrected_target=None):
         """
         Set the temperature with optional offset correction.
         
         Args:
             desired_liquid_temp: Desired liquid temperature in °C
             use_correction: Whether to apply the offset correction formula
+            corrected_target: Holder target already calculated for desired_liquid_temp
+                (calculated here if None)
             
         Returns:
             Boolean indicating success
@@ -348,13 +473,14 @@ class TemperatureControl:
                 logging.info(f"Target temperature set to {desired_liquid_temp:.2f}°C (no correction)")
             return success
         else:
-            # Get current ambient temperature if available
-            ambient_temp = None
-            if self.arduino and self.use_ambient_correction:
-                _, ambient_temp = self.arduino.read_temperatures()
-            
-            # Apply temperature offset correction
-            corrected_target = self.calculate_corrected_target(desired_liquid_temp, ambient_temp)
+            if corrected_target is None:
+                # Get current ambient temperature if available
+                ambient_temp = None
+                if self.arduino and self.use_ambient_correction:
+                    _, ambient_temp = self.arduino.read_temperatures()
+                
+                # Apply temperature offset correction
+                corrected_target = self.calculate_corrected_target(desired_liquid_temp, ambient_temp)
             
             # Set the corrected target temperature
             success = self.tec.set_target_temperature(corrected_target)
@@ -382,6 +508,7 @@ class TemperatureControl:
             return False
         
         self.experiment_running = True
+        self.experiment_stop_event.clear()
         logging.info(f"Starting experiment: {start_temp}°C to {stop_temp}°C "
                      f"in {increment}°C steps with {stabilization_time_minutes} minutes stabilization")
         logging.info(f"Temperature correction: {'Enabled' if use_correction else 'Disabled'}")
@@ -392,18 +519,25 @@ class TemperatureControl:
         elif start_temp > stop_temp and increment >= 0:
             increment = -abs(increment)
         
-        # Calculate temperature steps
-        steps = []
-        current_temp = start_temp
-        
-        if increment > 0:  # Increasing temperature
-            while current_temp <= stop_temp:
-                steps.append(current_temp)
-                current_temp += increment
-        else:  # Decreasing temperature
-            while current_temp >= stop_temp:
-                steps.append(current_temp)
-                current_temp += increment  # Note: increment is negative here
+        # Calculate temperature steps from the step index, so rounding errors do not
+        # add up over the sweep (the small tolerance keeps an exact stop temperature)
+        if increment == 0:
+            steps = [start_temp]
+        else:
+            step_count = int(math.floor((stop_temp - start_temp) / increment + 1e-9)) + 1
+            steps = [start_temp + i * increment for i in range(step_count)]
+        
+        # Without ambient correction the holder targets depend only on the steps,
+        # so calculate them all at once (with ambient correction they use the
+        # ambient temperature read when each step starts)
+        planned_targets = None
+        if use_correction and not (self.arduino and self.use_ambient_correction):
+            planned_targets = self.calculate_corrected_targets(steps).tolist()
+            if all(math.isfinite(target) for target in planned_targets):
+                logging.info("Holder targets: " + ", ".join(f"{target:.2f}°C" for target in planned_targets))
+            else:
+                # Leave the fallbacks (and their warnings) to the per-step calculation
+                planned_targets = None
         
         # Start monitoring if not already running
         was_running = self.running
@@ -416,7 +550,8 @@ class TemperatureControl:
                 logging.info(f"Step {i+1}/{len(steps)}: Setting temperature to {temp:.2f}°C")
                 
                 # Set target temperature with or without correction
-                if not self.set_temperature(temp, use_correction=use_correction):
+                corrected_target = planned_targets[i] if planned_targets else None
+                if not self.set_temperature(temp, use_correction=use_correction, corrected_target=corrected_target):
                     logging.error(f"Failed to set temperature for step {i+1}")
                     self.experiment_running = False
                     return False
@@ -427,14 +562,11 @@ class TemperatureControl:
                 # Wait for stabilization time
                 logging.info(f"Waiting {stabilization_time_minutes} minutes for stabilization...")
                 
-                # Wait in small increments to allow for interruption
-                stabilization_seconds = stabilization_time_minutes * 60
-                for _ in range(stabilization_seconds):
-                    if self.stop_event.is_set() or not self.experiment_running:
-                        logging.info("Experiment interrupted")
-                        self.experiment_running = False
-                        return False
-                    time.sleep(1)
+                # Wait for the stabilization time, or until the experiment is stopped
+                if self._wait_for_experiment_stop(stabilization_time_minutes * 60):
+                    logging.info("Experiment interrupted")
+                    self.experiment_running = False
+                    return False
                 
                 step_end = datetime.datetime.now()
                 step_duration = (step_end - step_start).total_seconds() / 60
@@ -455,10 +587,45 @@ class TemperatureControl:
             if not was_running:
                 self.stop_monitoring()
     
+    def _experiment_stop_requested(self):
+        """Check whether the running experiment should end."""
+        return (not self.experiment_running or self.stop_event.is_set()
+                or (self.shutdown_event is not None and self.shutdown_event.is_set()))
+    
+    def _wait_for_experiment_stop(self, timeout):
+        """
+        Wait until the experiment is stopped or the timeout has passed.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            
+        Returns:
+            Boolean indicating whether the experiment was stopped
+        """
+        deadline = time.monotonic() + timeout
+        while not self._experiment_stop_requested():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # stop_experiment, stop_monitoring and request_shutdown set the event;
+            # the flags are re-checked after every wakeup
+            if self.experiment_stop_event.wait(remaining) and not self._experiment_stop_requested():
+                self.experiment_stop_event.clear()  # Stale wakeup, keep waiting
+        return True
+    
+    def request_shutdown(self):
+        """
+        Wake a running experiment so it sees that shutdown_event is set.
+        
+        Safe to call from a signal handler.
+        """
+        self.experiment_stop_event.set()
+    
     def stop_experiment(self):
         """Stop the running experiment."""
         if self.experiment_running:
             self.experiment_running = False
+            self.experiment_stop_event.set()
             logging.info("Experiment stopping...")
             return True
         else:
@@ -5,30 +5,45 @@ Arduino Interface
 This module provides an interface to the Arduino that reads liquid and ambient temperatures.
 """
 
-import serial
 import time
 import logging
 import re
 
+# Patterns for parsing the Arduino's temperature response
+_PT100_RE = re.compile(r'Pt100\s*([\d.]+)')
+_PT1000_RE = re.compile(r'Pt1000\s*([\d.]+)')
+_NUMBER_RE = re.compile(r'([\d.]+)')
+
 class ArduinoInterface:
     """Interface for the Arduino that reads liquid and ambient temperatures."""
     
-    def __init__(self, port=None):
-        """Initialize connection to Arduino."""
+    def __init__(self, port=None, timeout=1.0):
+        """
+        Initialize connection to Arduino.
+        
+        Args:
+            port: Serial port of the Arduino
+            timeout: Maximum time in seconds to wait for a response line
+        """
         self.port = port
+        self.timeout = timeout
         self.ser = None
         self.connected = False
     
     def connect(self):
         """Establish serial connection to the Arduino."""
         try:
+            import serial
+            
             self.ser = serial.Serial(
                 port=self.port,
                 baudrate=9600,  # Standard Arduino baud rate
-                timeout=1
+                timeout=self.timeout
             )
-            # Allow time for Arduino to reset after connecting
-            time.sleep(2)
+            self._enable_low_latency()
+            # Wait for the Arduino to come back from the reset triggered by opening the port
+            if not self._wait_until_ready():
+                logging.warning("Arduino did not respond within the startup window")
             self.connected = True
             logging.info(f"Connected to Arduino on {self.port}")
             
@@ -46,6 +61,47 @@ class ArduinoInterface:
             logging.error(f"Failed to connect to Arduino: {e}")
             return False
     
+    def _wait_until_ready(self, timeout=2.5, probe_interval=0.2):
+        """
+        Poll the Arduino until it answers a READ request.
+        
+        Boards that auto-reset on connect take up to ~2 s to boot, boards with
+        native USB do not reset at all, so probe instead of sleeping for the worst case.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+            probe_interval: Read timeout for each probe in seconds
+            
+        Returns:
+            Boolean indicating whether the Arduino responded
+        """
+        deadline = time.monotonic() + timeout
+        port_timeout = self.ser.timeout
+        self.ser.timeout = probe_interval
+        try:
+            while time.monotonic() < deadline:
+                self.ser.write(b"READ\n")
+                if self.ser.read_until(b"\n", 128).strip():
+                    return True
+            return False
+        finally:
+            self.ser.timeout = port_timeout
+    
+    def _enable_low_latency(self):
+        """
+        Ask the USB-serial driver to pass on received bytes immediately.
+        
+        On Linux, FTDI-style adapters otherwise hold small replies for up to
+        16 ms before handing them to the host. Not all drivers support it,
+        so failure only gets logged at debug level.
+        """
+        if not hasattr(self.ser, 'set_low_latency_mode'):
+            return
+        try:
+            self.ser.set_low_latency_mode(True)
+        except Exception as e:
+            logging.debug(f"Low latency mode not available on {self.port}: {e}")
+    
     def disconnect(self):
         """Close the serial connection."""
         if self.ser and self.connected:
@@ -64,22 +120,28 @@ class ArduinoInterface:
             return None, None
         
         try:
-            # Clear input buffer
-            self.ser.reset_input_buffer()
+            # Clear stale input (e.g. a late reply to a timed-out request)
+            if self.ser.in_waiting:
+                self.ser.reset_input_buffer()
             
             # Request temperatures
             self.ser.write(b"READ\n")
             
-            # Wait for response
-            time.sleep(0.1)
-            
-            # Read response
-            response = self.ser.readline().decode().strip()
+            # Read response; returns as soon as the newline arrives (bounded by the port timeout)
+            response = self.ser.read_until(b"\n", 128).decode().strip()
             
             # Parse response (try multiple patterns)
+            # Fast path for the usual "Pt100 <ambient> Pt1000 <liquid>" line
+            parts = response.split()
+            if len(parts) == 4 and parts[0] == 'Pt100' and parts[2] == 'Pt1000':
+                try:
+                    return float(parts[3]), float(parts[1])
+                except ValueError:
+                    pass
+            
             # Try pattern with Pt100/Pt1000 prefixes
-            pt100_match = re.search(r'Pt100\s*([\d.]+)', response)
-            pt1000_match = re.search(r'Pt1000\s*([\d.]+)', response)
+            pt100_match = _PT100_RE.search(response)
+            pt1000_match = _PT1000_RE.search(response)
             
             if pt100_match and pt1000_match:
                 ambient_temp = float(pt100_match.group(1))
@@ -88,7 +150,7 @@ class ArduinoInterface:
             
             # Try simple comma-separated pattern
             if ',' in response:
-                parts = response.split(',')
+                parts = response.split(',', 2)
                 if len(parts) >= 2:
                     try:
                         liquid_temp = float(parts[0])
@@ -98,7 +160,7 @@ class ArduinoInterface:
                         pass
             
             # Try finding any numbers as last resort
-            numbers = re.findall(r'([\d.]+)', response)
+            numbers = _NUMBER_RE.findall(response)
             if len(numbers) >= 2:
                 try:
                     liquid_temp = float(numbers[1])  # Pt1000 usually comes second
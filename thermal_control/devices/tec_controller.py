@@ -5,10 +5,18 @@ TEC Controller Interface
 This module provides an interface to the Meerstetter TEC Controller using the MeCom protocol.
 """
 
-import os
-import sys
 import logging
-import time
+
+# Imported once per process; the package needs pyserial
+try:
+    from thermal_control.mecom import MeCom
+except ImportError as e:
+    MeCom = None
+    _MECOM_IMPORT_ERROR = e
+
+# Consecutive failed batched reads after which batching is switched off
+# (a single failure is usually a transient timeout or checksum error)
+_BATCH_FAILURE_LIMIT = 3
 
 class TECController:
     """Interface for the Meerstetter TEC Controller."""
@@ -19,19 +27,14 @@ class TECController:
         self.address = address
         self.device = None
         self.connected = False
+        self.batch_reads = True  # Disabled automatically if the device rejects pipelined queries
+        self._batch_failures = 0  # Consecutive failed batched reads
         
-        # Try to import the MeCom library
-        try:
-            # Import directly from mecom folder
-            module_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            sys.path.append(module_dir)
-            from mecom.mecom import MeCom
-            self.MeCom = MeCom
-            logging.info("Successfully imported MeCom library")
-            self.mecom_available = True
-        except ImportError:
-            logging.error("MeCom library not found. Please ensure it's in the Python path.")
-            self.mecom_available = False
+        # MeCom library, imported at module level
+        self.MeCom = MeCom
+        self.mecom_available = MeCom is not None
+        if not self.mecom_available:
+            logging.error(f"MeCom library could not be imported: {_MECOM_IMPORT_ERROR}")
     
     def connect(self):
         """Establish connection to the TEC controller."""
@@ -132,17 +135,33 @@ class TECController:
             logging.error(f"Error getting sink temperature: {e}")
             return None
     
-    def calculate_power(self):
-        """Calculate the power consumption of the Peltier element."""
+    def calculate_power(self, current=None, voltage=None):
+        """
+        Calculate the power consumption of the Peltier element.
+        
+        Args:
+            current: Output current in A if already read (queried otherwise)
+            voltage: Output voltage in V if already read (queried otherwise)
+            
+        Returns:
+            Power in W, or None if unavailable
+        """
+        if current is not None and voltage is not None:
+            return abs(current * voltage)
+        
         if not self.connected:
             logging.error("Not connected to TEC Controller")
             return None
             
         try:
-            # Parameter 1020 is Actual Output Current
-            current = self.device.get_parameter(parameter_id=1020, address=self.address)
-            # Parameter 1021 is Actual Output Voltage
-            voltage = self.device.get_parameter(parameter_id=1021, address=self.address)
+            if self.batch_reads:
+                # Parameters 1020/1021 are Actual Output Current/Voltage, read in one exchange
+                current, voltage = self.device.get_parameters([1020, 1021], address=self.address)
+            else:
+                # Parameter 1020 is Actual Output Current
+                current = self.device.get_parameter(parameter_id=1020, address=self.address)
+                # Parameter 1021 is Actual Output Voltage
+                voltage = self.device.get_parameter(parameter_id=1021, address=self.address)
             
             if current is not None and voltage is not None:
                 return abs(current * voltage)
@@ -150,7 +169,52 @@ class TECController:
         except Exception as e:
             logging.error(f"Error calculating power: {e}")
             return None
-
+    
+    def read_status_bundle(self):
+        """
+        Read holder, target and sink temperatures and the output power in one batch.
+        
+        The underlying parameter queries are pipelined over the serial link.
+        If a pipelined batch fails, the values are read one by one instead;
+        after several failures in a row batching is switched off for good.
+        
+        Returns:
+            Dict with holder_temp, target_temp, sink_temp and power (None where unavailable)
+        """
+        if not self.connected or not self.batch_reads:
+            return self._read_status_individually()
+        
+        try:
+            # Object temperature, target temperature, sink temperature, output current, output voltage
+            holder_temp, target_temp, sink_temp, current, voltage = self.device.get_parameters(
+                [1000, 3000, 1001, 1020, 1021], address=self.address)
+        except Exception as e:
+            self._batch_failures += 1
+            if self._batch_failures >= _BATCH_FAILURE_LIMIT:
+                logging.warning(f"Batched TEC read failed {self._batch_failures} times in a row ({e}), "
+                                f"switching to individual queries")
+                self.batch_reads = False
+            else:
+                logging.warning(f"Batched TEC read failed ({e}), reading values individually")
+            return self._read_status_individually()
+        
+        self._batch_failures = 0
+        return {
+            "holder_temp": holder_temp,
+            "target_temp": target_temp,
+            "sink_temp": sink_temp,
+            "power": self.calculate_power(current, voltage)
+        }
+    
+    def _read_status_individually(self):
+        """Read the values of read_status_bundle with one query each."""
+        return {
+            "holder_temp": self.get_object_temperature(),
+            "target_temp": self.get_target_temperature(),
+            "sink_temp": self.get_sink_temperature(),
+            "power": self.calculate_power()
+        }
+    
     def get_parameter(self, parameter_name=None, parameter_id=None):
         """Get parameter by name or ID."""
         if not self.connected:
@@ -85,16 +85,23 @@ class ParameterList(object):
         else:
             raise UnknownMeComType
 
+        # index by id and name, the first entry wins like in a linear search
+        self._BY_ID = {}
+        self._BY_NAME = {}
+        for parameter in self._PARAMETERS:
+            self._BY_ID.setdefault(parameter.id, parameter)
+            self._BY_NAME.setdefault(parameter.name, parameter)
+
     def get_by_id(self, id):
         """
         Returns a Parameter() identified by it's id.
         :param id: int
         :return: Parameter()
         """
-        for parameter in self._PARAMETERS:
-            if parameter.id == id:
-                return parameter
-        raise UnknownParameter
+        try:
+            return self._BY_ID[id]
+        except KeyError:
+            raise UnknownParameter
 
     def get_by_name(self, name):
         """
@@ -102,10 +109,10 @@ class ParameterList(object):
         :param name: str
         :return: Parameter()
         """
-        for parameter in self._PARAMETERS:
-            if parameter.name == name:
-                return parameter
-        raise UnknownParameter
+        try:
+            return self._BY_NAME[name]
+        except KeyError:
+            raise UnknownParameter
 
 
 class MeFrame(object):
@@ -670,6 +677,36 @@ class MeComCommon:
 
         return vr.RESPONSE.PAYLOAD[0]
 
+    def get_parameters(self, parameters, *args, **kwargs):
+        """
+        Get the values of several parameters given by name (str) or id (int).
+        The queries are sent as one batch if the connection supports it.
+        :param parameters: list of str or int
+        :param args:
+        :param kwargs:
+        :return: list of int or float, in the order of parameters
+        """
+        queries = []
+        for p in parameters:
+            if isinstance(p, str):
+                parameter = self._find_parameter(parameter_name=p, parameter_id=None)
+            else:
+                parameter = self._find_parameter(parameter_name=None, parameter_id=p)
+            queries.append(VR(parameter=parameter, *args, **kwargs))
+
+        # execute queries
+        queries = self._execute_many(queries)
+
+        return [vr.RESPONSE.PAYLOAD[0] for vr in queries]
+
+    def _execute_many(self, queries):
+        """
+        Execute several queries. Transports that can pipeline queries override this.
+        :param queries: list of Query
+        :return: list of Query
+        """
+        return [self._execute(query) for query in queries]
+
     def get_parameter_raw(self, parameter_id, parameter_format, *args, **kwargs):
         """
         Get the value of a parameter given by its id and format specifier.
@@ -847,6 +884,9 @@ class MeComTcp(MeComCommon):
         :param discardwait: int: waits at most for the specified amount of seconds for initial data to arrive, then discards it
         :param metype: str: either 'TEC', 'LDD-112x', 'LDD-130x' or 'LDD-1321'
         """
+        # bytes received but not yet consumed as a response frame
+        self._rx_buffer = bytearray()
+
         # initialize network connection
         self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.tcp.settimeout(timeout)
@@ -885,25 +925,43 @@ class MeComTcp(MeComCommon):
         else:
             return recv
 
+    def _read_frame(self):
+        """
+        Read one response frame from TCP, up to (excluding) the carriage return.
+        Data is received in chunks, bytes after the frame are kept for the next call.
+        """
+        while True:
+            end = self._rx_buffer.find(b"\r")
+            if end >= 0:
+                response_frame = bytes(self._rx_buffer[:end])
+                del self._rx_buffer[:end + 1]
+                return response_frame
+
+            # timeout is set on instance level
+            try:
+                chunk = self.tcp.recv(1024)
+            except socket.timeout:
+                # drop the partial frame, it must not be parsed as the start of the next response
+                self._rx_buffer.clear()
+                raise ResponseTimeout("timeout while communication via network")
+            if not chunk:
+                self._rx_buffer.clear()
+                raise ResponseTimeout("connection closed while communication via network")
+            self._rx_buffer += chunk
+
     def _execute(self, query):
         self.lock.acquire()
 
         try:
             query.set_sequence(self.SEQUENCE_COUNTER)
+            # bytes left over from an earlier exchange do not belong to this response
+            self._rx_buffer.clear()
             # send query
             self.tcp.sendall(query.compose())
             # print(query.compose())
 
             if query.ADDRESS != 255:
-                # initialize response and carriage return
-                cr = "\r".encode()
-                response_frame = b''
-                response_byte = self._read(size=1)  # read one byte at a time, timeout is set on instance level
-
-                # read until stop byte
-                while response_byte != cr:
-                    response_frame += response_byte
-                    response_byte = self._read(size=1)
+                response_frame = self._read_frame()
         finally:
             # increment sequence counter
             self._inc()
@@ -923,6 +981,44 @@ class MeComTcp(MeComCommon):
 
         return query
 
+    def _execute_many(self, queries):
+        """
+        Send all queries in one sendall(), then read the responses in order.
+        This saves one network turnaround per query compared to _execute().
+        :param queries: list of Query
+        :return: list of Query
+        """
+        self.lock.acquire()
+
+        try:
+            frames = []
+            for query in queries:
+                query.set_sequence(self.SEQUENCE_COUNTER)
+                frames.append(query.compose())
+                self._inc()
+
+            # bytes left over from an earlier exchange do not belong to these responses
+            self._rx_buffer.clear()
+            # send all queries at once
+            self.tcp.sendall(b"".join(frames))
+
+            # responses arrive in the order the queries were sent
+            response_frames = [self._read_frame() if query.ADDRESS != 255 else None for query in queries]
+        finally:
+            self.lock.release()
+
+        for query, response_frame in zip(queries, response_frames):
+            if response_frame is not None:
+                # strip source byte, set_response also checks the sequence number
+                query.set_response(response_frame[1:])
+            else:
+                query.RESPONSE = EmptyResponse()
+
+            # did we encounter an error?
+            self._raise(query)
+
+        return queries
+
 
 class MeComSerial(MeComCommon):
     """
@@ -969,6 +1065,16 @@ class MeComSerial(MeComCommon):
         else:
             return recv
 
+    def _read_frame(self):
+        """
+        Read one response frame from serial, up to (excluding) the carriage return.
+        """
+        # read up to and including the stop byte in one call, timeout is set on instance level
+        response_frame = self.ser.read_until(b"\r")
+        if not response_frame.endswith(b"\r"):
+            raise ResponseTimeout("timeout while communication via serial")
+        return response_frame[:-1]
+
     def _execute(self, query):
         self.lock.acquire()
 
@@ -986,15 +1092,7 @@ class MeComSerial(MeComCommon):
             self.ser.flush()
 
             if query.ADDRESS != 255:
-                # initialize response and carriage return
-                cr = "\r".encode()
-                response_frame = b''
-                response_byte = self._read(size=1)  # read one byte at a time, timeout is set on instance level
-
-                # read until stop byte
-                while response_byte != cr:
-                    response_frame += response_byte
-                    response_byte = self._read(size=1)
+                response_frame = self._read_frame()
         finally:
             # increment sequence counter
             self._inc()
@@ -1014,6 +1112,47 @@ class MeComSerial(MeComCommon):
 
         return query
 
+    def _execute_many(self, queries):
+        """
+        Send all queries back-to-back, then read the responses in order.
+        This saves one serial turnaround per query compared to _execute().
+        :param queries: list of Query
+        :return: list of Query
+        """
+        self.lock.acquire()
+
+        try:
+            # clear buffers
+            self.ser.reset_output_buffer()
+            self.ser.reset_input_buffer()
+
+            frames = []
+            for query in queries:
+                query.set_sequence(self.SEQUENCE_COUNTER)
+                frames.append(query.compose())
+                self._inc()
+
+            # send all queries in one write
+            self.ser.write(b"".join(frames))
+            self.ser.flush()
+
+            # responses arrive in the order the queries were sent
+            response_frames = [self._read_frame() if query.ADDRESS != 255 else None for query in queries]
+        finally:
+            self.lock.release()
+
+        for query, response_frame in zip(queries, response_frames):
+            if response_frame is not None:
+                # strip source byte, set_response also checks the sequence number
+                query.set_response(response_frame[1:])
+            else:
+                query.RESPONSE = EmptyResponse()
+
+            # did we encounter an error?
+            self._raise(query)
+
+        return queries
+
 
 class MeCom(MeComSerial):
     """
@@ -6,11 +6,105 @@ This module provides a command-line interface for temperature control.
 """
 
 import argparse
-import logging
-import time
-import os
-import sys
+import threading
 from thermal_control.utils.logger import Colors
+from thermal_control.utils.prompt import iter_commands, confirm, enable_history
+
+# Prompt of the direct command mode
+_DIRECT_PROMPT = f"\n{Colors.CYAN}TEC> {Colors.RESET}"
+
+# Help text of the direct command mode
+_DIRECT_HELP_TEXT = "\n".join([
+    "\nAvailable commands:",
+    "  get temp       - Get object temperature",
+    "  get target     - Get target temperature",
+    "  get sink       - Get heat sink temperature",
+    "  get current    - Get output current",
+    "  get voltage    - Get output voltage",
+    "  get power      - Get power consumption",
+    "  set target X   - Set target temperature to X°C",
+    "  get param X    - Get parameter with ID X",
+    "  set param X Y  - Set parameter X to value Y",
+    "  status         - Get device status",
+    "  exit           - Exit direct mode",
+])
+
+def _direct_help(tec_controller, args):
+    """Handle the 'help' direct command."""
+    print(_DIRECT_HELP_TEXT)
+
+def _direct_get_temp(tec_controller, args):
+    """Handle the 'get temp' direct command."""
+    temp = tec_controller.get_object_temperature()
+    print(f"Object Temperature: {temp:.2f}°C")
+
+def _direct_get_target(tec_controller, args):
+    """Handle the 'get target' direct command."""
+    temp = tec_controller.get_target_temperature()
+    print(f"Target Temperature: {temp:.2f}°C")
+
+def _direct_get_sink(tec_controller, args):
+    """Handle the 'get sink' direct command."""
+    temp = tec_controller.get_sink_temperature()
+    print(f"Sink Temperature: {temp:.2f}°C")
+
+def _direct_get_current(tec_controller, args):
+    """Handle the 'get current' direct command."""
+    current = tec_controller.get_parameter(parameter_id=1020)
+    print(f"Output Current: {current:.3f} A")
+
+def _direct_get_voltage(tec_controller, args):
+    """Handle the 'get voltage' direct command."""
+    voltage = tec_controller.get_parameter(parameter_id=1021)
+    print(f"Output Voltage: {voltage:.3f} V")
+
+def _direct_get_power(tec_controller, args):
+    """Handle the 'get power' direct command."""
+    power = tec_controller.calculate_power()
+    print(f"Power Consumption: {power:.3f} W")
+
+def _direct_status(tec_controller, args):
+    """Handle the 'status' direct command."""
+    status = tec_controller.get_device_status()
+    print(f"Device Status: {status}")
+
+def _direct_set_target(tec_controller, args):
+    """Handle the 'set target' direct command."""
+    value = float(args[0])
+    if tec_controller.set_target_temperature(value):
+        print(f"Target temperature set to {value:.2f}°C")
+    else:
+        print("Failed to set target temperature")
+
+def _direct_get_param(tec_controller, args):
+    """Handle the 'get param' direct command."""
+    param_id = int(args[0])
+    value = tec_controller.get_parameter(parameter_id=param_id)
+    print(f"Parameter {param_id} value: {value}")
+
+def _direct_set_param(tec_controller, args):
+    """Handle the 'set param' direct command."""
+    param_id = int(args[0])
+    value = float(args[1])
+    if tec_controller.set_parameter(value=value, parameter_id=param_id):
+        print(f"Parameter {param_id} set to {value}")
+    else:
+        print(f"Failed to set parameter {param_id}")
+
+# Direct mode command handlers, keyed by the lower-case command words
+_DIRECT_COMMANDS = {
+    'help': _direct_help,
+    'status': _direct_status,
+    'get temp': _direct_get_temp,
+    'get target': _direct_get_target,
+    'get sink': _direct_get_sink,
+    'get current': _direct_get_current,
+    'get voltage': _direct_get_voltage,
+    'get power': _direct_get_power,
+    'get param': _direct_get_param,
+    'set target': _direct_set_target,
+    'set param': _direct_set_param,
+}
 
 def create_parser():
     """Create and return an argument parser for temperature control."""
@@ -28,6 +122,7 @@ def create_parser():
     mode_group.add_argument("--set-temp", type=float, help="Set a single target temperature")
     mode_group.add_argument("--interactive", action="store_true", help="Run in interactive mode")
     mode_group.add_argument("--direct", action="store_true", help="Direct command mode for TEC controller")
+    mode_group.add_argument("--script", metavar="FILE", help="Run interactive-mode commands from a file")
     
     # Experiment options
     exp_group = parser.add_argument_group("Experiment Options")
@@ -54,91 +149,49 @@ def create_parser():
     output_group.add_argument("--log-level", choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
                             default="INFO", help="Logging level")
     output_group.add_argument("--quiet", action="store_true", help="Suppress console output")
+    output_group.add_argument("--yes", "-y", action="store_true", help="Proceed without asking to confirm the settings")
     
     return parser
 
-def direct_command_mode(tec_controller):
+def direct_command_mode(tec_controller, stop_event=None):
     """
     Interactive mode to send commands directly to the TEC controller.
     
     Args:
         tec_controller: TECController instance
+        stop_event: Optional threading.Event that ends the mode when set
     """
     print(f"\n{Colors.CYAN}Direct TEC Controller Command Mode{Colors.RESET}")
     print(f"{Colors.YELLOW}This mode allows you to interact with the TEC controller.{Colors.RESET}")
     print(f"{Colors.YELLOW}Type 'exit' to quit, 'help' for commands.{Colors.RESET}")
     
+    enable_history()
+    
     try:
-        while True:
-            command = input(f"\n{Colors.CYAN}TEC> {Colors.RESET}").strip()
+        for command in iter_commands(_DIRECT_PROMPT, stop_event):
+            parts = command.split()
+            if not parts:
+                continue
             
-            if command.lower() == 'exit':
+            verb = parts[0].lower()
+            if verb == 'exit':
                 break
-            elif command.lower() == 'help':
-                print("\nAvailable commands:")
-                print("  get temp       - Get object temperature")
-                print("  get target     - Get target temperature")
-                print("  get sink       - Get heat sink temperature")
-                print("  get current    - Get output current")
-                print("  get voltage    - Get output voltage")
-                print("  get power      - Get power consumption")
-                print("  set target X   - Set target temperature to X°C")
-                print("  get param X    - Get parameter with ID X")
-                print("  set param X Y  - Set parameter X to value Y")
-                print("  status         - Get device status")
-                print("  exit           - Exit direct mode")
-            elif command.lower() == 'get temp':
-                temp = tec_controller.get_object_temperature()
-                print(f"Object Temperature: {temp:.2f}°C")
-            elif command.lower() == 'get target':
-                temp = tec_controller.get_target_temperature()
-                print(f"Target Temperature: {temp:.2f}°C")
-            elif command.lower() == 'get sink':
-                temp = tec_controller.get_sink_temperature()
-                print(f"Sink Temperature: {temp:.2f}°C")
-            elif command.lower() == 'get current':
-                current = tec_controller.get_parameter(parameter_id=1020)
-                print(f"Output Current: {current:.3f} A")
-            elif command.lower() == 'get voltage':
-                voltage = tec_controller.get_parameter(parameter_id=1021)
-                print(f"Output Voltage: {voltage:.3f} V")
-            elif command.lower() == 'get power':
-                power = tec_controller.calculate_power()
-                print(f"Power Consumption: {power:.3f} W")
-            elif command.lower() == 'status':
-                status = tec_controller.get_device_status()
-                print(f"Device Status: {status}")
-            elif command.lower().startswith('set target '):
-                try:
-                    value = float(command.split()[2])
-                    success = tec_controller.set_target_temperature(value)
-                    if success:
-                        print(f"Target temperature set to {value:.2f}°C")
-                    else:
-                        print("Failed to set target temperature")
-                except Exception as e:
-                    print(f"Error: {e}")
-            elif command.lower().startswith('get param '):
-                try:
-                    param_id = int(command.split()[2])
-                    value = tec_controller.get_parameter(parameter_id=param_id)
-                    print(f"Parameter {param_id} value: {value}")
-                except Exception as e:
-                    print(f"Error: {e}")
-            elif command.lower().startswith('set param '):
-                try:
-                    parts = command.split()
-                    param_id = int(parts[2])
-                    value = float(parts[3])
-                    success = tec_controller.set_parameter(value=value, parameter_id=param_id)
-                    if success:
-                        print(f"Parameter {param_id} set to {value}")
-                    else:
-                        print(f"Failed to set parameter {param_id}")
-                except Exception as e:
-                    print(f"Error: {e}")
-            else:
+            
+            # Two-word commands (get/set ...) first, then single words
+            handler = _DIRECT_COMMANDS.get(" ".join(parts[:2]).lower())
+            args = parts[2:]
+            if handler is None:
+                handler = _DIRECT_COMMANDS.get(verb)
+                args = parts[1:]
+            
+            if handler is None:
                 print(f"Unknown command: {command}. Type 'help' for available commands.")
+                continue
+            
+            try:
+                handler(tec_controller, args)
+            except Exception as e:
+                print(f"Error: {e}")
     except KeyboardInterrupt:
         print("\nExiting direct command mode.")
 
@@ -168,6 +221,8 @@ def confirm_settings(args, tec_port, arduino_port):
         print("  Mode: Direct TEC controller command mode")
     elif args.monitor:
         print("  Mode: Monitor only (will not set temperature)")
+    elif args.script:
+        print(f"  Mode: Command script ({args.script})")
     elif args.experiment:
         print("  Mode: Temperature experiment")
         print(f"    Start temperature: {args.start_temp}°C")
@@ -176,7 +231,7 @@ def confirm_settings(args, tec_port, arduino_port):
         print(f"    Stabilization time: {args.stab_time} minutes")
         print(f"    Temperature correction: {'Disabled' if args.no_correction else 'Enabled'}")
     elif args.set_temp is not None:
-        print(f"  Mode: Set and monitor")
+        print("  Mode: Set and monitor")
         print(f"    Target temperature: {args.set_temp}°C")
         print(f"    Temperature correction: {'Disabled' if args.no_correction else 'Enabled'}")
     else:
@@ -188,29 +243,31 @@ def confirm_settings(args, tec_port, arduino_port):
         print("  Data output file: Auto-generated")
     
     # Confirm before proceeding
-    confirm = input("\nProceed with these settings? (y/n): ")
-    return confirm.lower() == 'y'
+    return confirm("\nProceed with these settings? (y/n): ", assume_yes=args.yes)
 
-def run_monitor_mode(temp_control):
+def run_monitor_mode(temp_control, shutdown_event=None):
     """
     Run in monitor-only mode.
     
     Args:
         temp_control: TemperatureControl instance
+        shutdown_event: threading.Event set when the program should stop
+                        (only Ctrl+C ends the mode if None)
     """
+    shutdown_event = shutdown_event or threading.Event()
     try:
         temp_control.start_monitoring()
         print(f"\n{Colors.GREEN}Monitoring started. Press Ctrl+C to stop.{Colors.RESET}")
         
-        # Keep running until interrupted
-        while True:
-            time.sleep(1)
+        # Block until shutdown is requested
+        shutdown_event.wait()
+        print(f"\n{Colors.YELLOW}Monitoring interrupted{Colors.RESET}")
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Monitoring interrupted{Colors.RESET}")
     finally:
         temp_control.stop_monitoring()
 
-def run_single_temperature_mode(temp_control, target_temp, use_correction):
+def run_single_temperature_mode(temp_control, target_temp, use_correction, shutdown_event=None):
     """
     Set and monitor a single temperature.
     
@@ -218,7 +275,10 @@ def run_single_temperature_mode(temp_control, target_temp, use_correction):
         temp_control: TemperatureControl instance
         target_temp: Target temperature to set
         use_correction: Whether to use temperature correction
+        shutdown_event: threading.Event set when the program should stop
+                        (only Ctrl+C ends the mode if None)
     """
+    shutdown_event = shutdown_event or threading.Event()
     try:
         # Start monitoring
         temp_control.start_monitoring()
@@ -230,9 +290,9 @@ def run_single_temperature_mode(temp_control, target_temp, use_correction):
         
         print(f"\n{Colors.GREEN}Temperature set to {target_temp}°C. Press Ctrl+C to stop.{Colors.RESET}")
         
-        # Keep running until interrupted
-        while True:
-            time.sleep(1)
+        # Block until shutdown is requested
+        shutdown_event.wait()
+        print(f"\n{Colors.YELLOW}Temperature control interrupted{Colors.RESET}")
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Temperature control interrupted{Colors.RESET}")
     finally:
@@ -6,7 +6,70 @@ This module provides an interactive command-line interface for temperature contr
 """
 
 import logging
+import functools
 from thermal_control.utils.logger import Colors
+from thermal_control.utils.prompt import iter_commands, confirm, enable_history
+
+# Help text is static, so build it once
+_HELP_TEXT = "\n".join([
+    f"\n{Colors.CYAN}Temperature Control Interactive Mode{Colors.RESET}",
+    f"{Colors.CYAN}================================={Colors.RESET}",
+    "Available commands:",
+    f"  {Colors.GREEN}set X{Colors.RESET}     - Set temperature to X°C (with offset correction)",
+    f"  {Colors.GREEN}setraw X{Colors.RESET}  - Set temperature to X°C (without offset correction)",
+    f"  {Colors.GREEN}mon{Colors.RESET}       - Start/stop monitoring",
+    f"  {Colors.GREEN}exp X Y Z W{Colors.RESET} - Run experiment from X°C to Y°C in Z°C steps with W minutes stabilization",
+    f"  {Colors.GREEN}expraw X Y Z W{Colors.RESET} - Run experiment without offset correction",
+    f"  {Colors.GREEN}stop{Colors.RESET}      - Stop running experiment",
+    f"  {Colors.GREEN}save [file]{Colors.RESET} - Save collected data to CSV file",
+    f"  {Colors.GREEN}status{Colors.RESET}    - Show current temperatures",
+    f"  {Colors.GREEN}stats{Colors.RESET}     - Show summary statistics",
+    f"  {Colors.GREEN}config{Colors.RESET}    - Show/change correction parameters",
+    f"  {Colors.GREEN}help{Colors.RESET}      - Show this help",
+    f"  {Colors.GREEN}exit{Colors.RESET}      - Exit program",
+])
+
+# Prompts and headings reused on every command
+_PROMPT = f"\n{Colors.CYAN}> {Colors.RESET}"
+_SCRIPT_ECHO = f"{Colors.CYAN}> {Colors.RESET}"
+_STATUS_HEADER = f"\n{Colors.CYAN}Current Temperatures:{Colors.RESET}"
+
+# Readings shown by the status command: (label, data point key, unit)
+_STATUS_FIELDS = (
+    ("Holder:  ", "holder_temp", "°C"),
+    ("Liquid:  ", "liquid_temp", "°C"),
+    ("Ambient: ", "ambient_temp", "°C"),
+    ("Target:  ", "target_temp", "°C"),
+    ("Sink:    ", "sink_temp", "°C"),
+    ("Power:   ", "power", "W"),
+)
+
+# Temperatures summarised by the stats command: (name, data point key)
+_STATISTICS_FIELDS = (
+    ("Holder", "holder_temp"),
+    ("Liquid", "liquid_temp"),
+    ("Ambient", "ambient_temp"),
+)
+
+def _ask_float(prompt, current):
+    """
+    Ask for a number, showing the current value.
+    
+    Args:
+        prompt: Question to display
+        current: Current value, kept if the answer is empty
+        
+    Returns:
+        Entered number, or None to keep the current value (also at the end of input)
+        
+    Raises:
+        ValueError: If the answer is not a number
+    """
+    try:
+        answer = input(f"{prompt} [{current}]: ")
+    except EOFError:
+        return None  # End of input, keep the current value
+    return float(answer) if answer.strip() else None
 
 class InteractiveUI:
     """Interactive user interface for temperature control."""
@@ -22,36 +85,36 @@ class InteractiveUI:
         self.temp_control = temp_control
         self.data_manager = data_manager
         self.running = False
+        
+        # Command verb -> handler taking the rest of the command line
+        self.commands = {
+            'help': self._cmd_help,
+            'exit': self._cmd_exit,
+            'status': self._cmd_status,
+            'stats': self._cmd_stats,
+            'config': self._cmd_config,
+            'mon': self._cmd_monitor,
+            'set': functools.partial(self._cmd_set, use_correction=True),
+            'setraw': functools.partial(self._cmd_set, use_correction=False),
+            'exp': functools.partial(self._cmd_experiment, use_correction=True),
+            'expraw': functools.partial(self._cmd_experiment, use_correction=False),
+            'stop': self._cmd_stop,
+            'save': self._cmd_save,
+        }
     
     def print_help(self):
         """Print available commands."""
-        print(f"\n{Colors.CYAN}Temperature Control Interactive Mode{Colors.RESET}")
-        print(f"{Colors.CYAN}================================={Colors.RESET}")
-        print("Available commands:")
-        print(f"  {Colors.GREEN}set X{Colors.RESET}     - Set temperature to X°C (with offset correction)")
-        print(f"  {Colors.GREEN}setraw X{Colors.RESET}  - Set temperature to X°C (without offset correction)")
-        print(f"  {Colors.GREEN}mon{Colors.RESET}       - Start/stop monitoring")
-        print(f"  {Colors.GREEN}exp X Y Z W{Colors.RESET} - Run experiment from X°C to Y°C in Z°C steps with W minutes stabilization")
-        print(f"  {Colors.GREEN}expraw X Y Z W{Colors.RESET} - Run experiment without offset correction")
-        print(f"  {Colors.GREEN}stop{Colors.RESET}      - Stop running experiment")
-        print(f"  {Colors.GREEN}save [file]{Colors.RESET} - Save collected data to CSV file")
-        print(f"  {Colors.GREEN}status{Colors.RESET}    - Show current temperatures")
-        print(f"  {Colors.GREEN}stats{Colors.RESET}     - Show summary statistics")
-        print(f"  {Colors.GREEN}config{Colors.RESET}    - Show/change correction parameters")
-        print(f"  {Colors.GREEN}help{Colors.RESET}      - Show this help")
-        print(f"  {Colors.GREEN}exit{Colors.RESET}      - Exit program")
+        print(_HELP_TEXT)
     
     def print_status(self):
         """Print current temperature status."""
         data_point = self.temp_control.read_all_sensors()
         
-        print(f"\n{Colors.CYAN}Current Temperatures:{Colors.RESET}")
-        print(f"  Holder:  {data_point['holder_temp']:.2f}°C" if data_point['holder_temp'] is not None else "  Holder:  N/A")
-        print(f"  Liquid:  {data_point['liquid_temp']:.2f}°C" if data_point['liquid_temp'] is not None else "  Liquid:  N/A")
-        print(f"  Ambient: {data_point['ambient_temp']:.2f}°C" if data_point['ambient_temp'] is not None else "  Ambient: N/A")
-        print(f"  Target:  {data_point['target_temp']:.2f}°C" if data_point['target_temp'] is not None else "  Target:  N/A")
-        print(f"  Sink:    {data_point['sink_temp']:.2f}°C" if data_point['sink_temp'] is not None else "  Sink:    N/A")
-        print(f"  Power:   {data_point['power']:.2f}W" if data_point['power'] is not None else "  Power:   N/A")
+        lines = [_STATUS_HEADER]
+        for label, key, unit in _STATUS_FIELDS:
+            value = data_point[key]
+            lines.append(f"  {label}{value:.2f}{unit}" if value is not None else f"  {label}N/A")
+        print("\n".join(lines))
     
     def print_statistics(self):
         """Print summary statistics."""
@@ -60,60 +123,47 @@ class InteractiveUI:
             print(f"{Colors.YELLOW}No data available for statistics{Colors.RESET}")
             return
         
-        print(f"\n{Colors.CYAN}Summary Statistics:{Colors.RESET}")
-        print(f"  {Colors.CYAN}Holder Temperature:{Colors.RESET}")
-        print(f"    Mean: {stats.get('holder_temp_mean', 'N/A'):.2f}°C")
-        print(f"    Min:  {stats.get('holder_temp_min', 'N/A'):.2f}°C")
-        print(f"    Max:  {stats.get('holder_temp_max', 'N/A'):.2f}°C")
-        print(f"    Std:  {stats.get('holder_temp_std', 'N/A'):.3f}°C")
-        
-        if 'liquid_temp_mean' in stats:
-            print(f"  {Colors.CYAN}Liquid Temperature:{Colors.RESET}")
-            print(f"    Mean: {stats.get('liquid_temp_mean'):.2f}°C")
-            print(f"    Min:  {stats.get('liquid_temp_min'):.2f}°C")
-            print(f"    Max:  {stats.get('liquid_temp_max'):.2f}°C")
-            print(f"    Std:  {stats.get('liquid_temp_std'):.3f}°C")
-        
-        if 'ambient_temp_mean' in stats:
-            print(f"  {Colors.CYAN}Ambient Temperature:{Colors.RESET}")
-            print(f"    Mean: {stats.get('ambient_temp_mean'):.2f}°C")
-            print(f"    Min:  {stats.get('ambient_temp_min'):.2f}°C")
-            print(f"    Max:  {stats.get('ambient_temp_max'):.2f}°C")
-            print(f"    Std:  {stats.get('ambient_temp_std'):.3f}°C")
+        lines = [f"\n{Colors.CYAN}Summary Statistics:{Colors.RESET}"]
+        for name, field in _STATISTICS_FIELDS:
+            # Holder statistics are always listed, the Arduino readings only if recorded
+            if field != 'holder_temp' and f"{field}_mean" not in stats:
+                continue
+            lines.append(f"  {Colors.CYAN}{name} Temperature:{Colors.RESET}")
+            for label, suffix, precision in (("Mean: ", "mean", 2), ("Min:  ", "min", 2),
+                                             ("Max:  ", "max", 2), ("Std:  ", "std", 3)):
+                value = stats.get(f"{field}_{suffix}")
+                lines.append(f"    {label}{value:.{precision}f}°C" if value is not None else f"    {label}N/A")
+        print("\n".join(lines))
     
     def show_config(self):
         """Show and optionally update correction parameters."""
-        print(f"\n{Colors.CYAN}Current Correction Parameters:{Colors.RESET}")
-        print(f"  Formula: y = {self.temp_control.a}x² + {self.temp_control.b}x + {self.temp_control.c}")
-        print(f"  Ambient correction: {'Enabled' if self.temp_control.use_ambient_correction else 'Disabled'}")
+        lines = [
+            f"\n{Colors.CYAN}Current Correction Parameters:{Colors.RESET}",
+            f"  Formula: y = {self.temp_control.a}x² + {self.temp_control.b}x + {self.temp_control.c}",
+            f"  Ambient correction: {'Enabled' if self.temp_control.use_ambient_correction else 'Disabled'}",
+        ]
         if self.temp_control.use_ambient_correction:
-            print(f"  Ambient reference: {self.temp_control.ambient_reference}°C")
-            print(f"  Ambient coefficient: {self.temp_control.ambient_coefficient}")
+            lines.append(f"  Ambient reference: {self.temp_control.ambient_reference}°C")
+            lines.append(f"  Ambient coefficient: {self.temp_control.ambient_coefficient}")
+        print("\n".join(lines))
         
-        change = input("\nDo you want to change these parameters? (y/n): ")
-        if change.lower() == 'y':
+        if confirm("\nDo you want to change these parameters? (y/n): "):
             try:
-                a_input = input(f"Enter coefficient a [{self.temp_control.a}]: ")
-                b_input = input(f"Enter coefficient b [{self.temp_control.b}]: ")
-                c_input = input(f"Enter coefficient c [{self.temp_control.c}]: ")
+                a = _ask_float("Enter coefficient a", self.temp_control.a)
+                b = _ask_float("Enter coefficient b", self.temp_control.b)
+                c = _ask_float("Enter coefficient c", self.temp_control.c)
                 
-                use_ambient_input = input(f"Enable ambient correction? (y/n) [{'y' if self.temp_control.use_ambient_correction else 'n'}]: ")
-                
-                # Update parameters
-                a = float(a_input) if a_input.strip() else None
-                b = float(b_input) if b_input.strip() else None
-                c = float(c_input) if c_input.strip() else None
-                use_ambient = use_ambient_input.lower() == 'y' if use_ambient_input.strip() else None
+                use_ambient = confirm(
+                    f"Enable ambient correction? (y/n) [{'y' if self.temp_control.use_ambient_correction else 'n'}]: ",
+                    default=self.temp_control.use_ambient_correction
+                )
                 
                 # If ambient correction enabled, ask for additional parameters
                 ambient_ref = None
                 ambient_coeff = None
-                if use_ambient or (use_ambient is None and self.temp_control.use_ambient_correction):
-                    ambient_ref_input = input(f"Enter ambient reference temperature [{self.temp_control.ambient_reference}]: ")
-                    ambient_coeff_input = input(f"Enter ambient coefficient [{self.temp_control.ambient_coefficient}]: ")
-                    
-                    ambient_ref = float(ambient_ref_input) if ambient_ref_input.strip() else None
-                    ambient_coeff = float(ambient_coeff_input) if ambient_coeff_input.strip() else None
+                if use_ambient:
+                    ambient_ref = _ask_float("Enter ambient reference temperature", self.temp_control.ambient_reference)
+                    ambient_coeff = _ask_float("Enter ambient coefficient", self.temp_control.ambient_coefficient)
                 
                 # Update parameters
                 self.temp_control.update_correction_parameters(
@@ -128,6 +178,85 @@ class InteractiveUI:
             except ValueError as e:
                 print(f"{Colors.RED}Error: Invalid input - {e}{Colors.RESET}")
     
+    def _cmd_help(self, args):
+        """Handle the 'help' command."""
+        self.print_help()
+    
+    def _cmd_exit(self, args):
+        """Handle the 'exit' command."""
+        return False
+    
+    def _cmd_status(self, args):
+        """Handle the 'status' command."""
+        self.print_status()
+    
+    def _cmd_stats(self, args):
+        """Handle the 'stats' command."""
+        self.print_statistics()
+    
+    def _cmd_config(self, args):
+        """Handle the 'config' command."""
+        self.show_config()
+    
+    def _cmd_monitor(self, args):
+        """Handle the 'mon' command (toggle monitoring)."""
+        if self.temp_control.running:
+            self.temp_control.stop_monitoring()
+            print(f"{Colors.GREEN}Monitoring stopped{Colors.RESET}")
+        else:
+            self.temp_control.start_monitoring()
+            print(f"{Colors.GREEN}Monitoring started{Colors.RESET}")
+    
+    def _cmd_set(self, args, use_correction):
+        """Handle the 'set' and 'setraw' commands."""
+        try:
+            temp = float(args)
+        except ValueError:
+            print(f"{Colors.RED}Invalid temperature{Colors.RESET}")
+            return
+        
+        if self.temp_control.set_temperature(temp, use_correction=use_correction):
+            mode = "with" if use_correction else "without"
+            print(f"{Colors.GREEN}Temperature set to {temp:.2f}°C {mode} correction{Colors.RESET}")
+        else:
+            print(f"{Colors.RED}Failed to set temperature{Colors.RESET}")
+    
+    def _cmd_experiment(self, args, use_correction):
+        """Handle the 'exp' and 'expraw' commands."""
+        try:
+            start, stop, step, stab = args.split()
+        except ValueError:
+            verb = 'exp' if use_correction else 'expraw'
+            print(f"{Colors.YELLOW}Usage: {verb} START_TEMP STOP_TEMP INCREMENT STAB_TIME{Colors.RESET}")
+            return
+        
+        try:
+            start_temp, stop_temp, increment, stab_time = float(start), float(stop), float(step), int(stab)
+        except ValueError as e:
+            print(f"{Colors.RED}Invalid experiment parameters: {e}{Colors.RESET}")
+            return
+        
+        if self.temp_control.run_experiment(start_temp, stop_temp, increment, stab_time,
+                                            use_correction=use_correction):
+            print(f"{Colors.GREEN}Experiment completed successfully{Colors.RESET}")
+        else:
+            print(f"{Colors.YELLOW}Experiment stopped{Colors.RESET}")
+    
+    def _cmd_stop(self, args):
+        """Handle the 'stop' command."""
+        if self.temp_control.stop_experiment():
+            print(f"{Colors.GREEN}Experiment stopped{Colors.RESET}")
+        else:
+            print(f"{Colors.YELLOW}No experiment running{Colors.RESET}")
+    
+    def _cmd_save(self, args):
+        """Handle the 'save [file]' command."""
+        saved_file = self.data_manager.save_to_csv(args or None)
+        if saved_file:
+            print(f"{Colors.GREEN}Data saved to {saved_file}{Colors.RESET}")
+        else:
+            print(f"{Colors.RED}Failed to save data{Colors.RESET}")
+    
     def handle_command(self, command):
         """
         Handle a command from the user.
@@ -138,132 +267,87 @@ class InteractiveUI:
         Returns:
             Boolean indicating whether to continue or exit
         """
-        try:
-            if command.lower() == 'help':
-                self.print_help()
-            
-            elif command.lower() == 'exit':
-                return False
-            
-            elif command.lower() == 'status':
-                self.print_status()
-            
-            elif command.lower() == 'stats':
-                self.print_statistics()
-            
-            elif command.lower() == 'config':
-                self.show_config()
-            
-            elif command.lower() == 'mon':
-                if self.temp_control.running:
-                    self.temp_control.stop_monitoring()
-                    print(f"{Colors.GREEN}Monitoring stopped{Colors.RESET}")
-                else:
-                    self.temp_control.start_monitoring()
-                    print(f"{Colors.GREEN}Monitoring started{Colors.RESET}")
-            
-            elif command.lower().startswith('set '):
-                try:
-                    temp = float(command[4:])
-                    if self.temp_control.set_temperature(temp, use_correction=True):
-                        print(f"{Colors.GREEN}Temperature set to {temp:.2f}°C with correction{Colors.RESET}")
-                    else:
-                        print(f"{Colors.RED}Failed to set temperature{Colors.RESET}")
-                except ValueError:
-                    print(f"{Colors.RED}Invalid temperature{Colors.RESET}")
-            
-            elif command.lower().startswith('setraw '):
-                try:
-                    temp = float(command[7:])
-                    if self.temp_control.set_temperature(temp, use_correction=False):
-                        print(f"{Colors.GREEN}Temperature set to {temp:.2f}°C without correction{Colors.RESET}")
-                    else:
-                        print(f"{Colors.RED}Failed to set temperature{Colors.RESET}")
-                except ValueError:
-                    print(f"{Colors.RED}Invalid temperature{Colors.RESET}")
-            
-            elif command.lower().startswith('exp '):
-                try:
-                    parts = command[4:].split()
-                    if len(parts) != 4:
-                        print(f"{Colors.YELLOW}Usage: exp START_TEMP STOP_TEMP INCREMENT STAB_TIME{Colors.RESET}")
-                        return True
-                    
-                    start_temp = float(parts[0])
-                    stop_temp = float(parts[1])
-                    increment = float(parts[2])
-                    stab_time = int(parts[3])
-                    
-                    # Run experiment with correction
-                    if self.temp_control.run_experiment(start_temp, stop_temp, increment, stab_time, use_correction=True):
-                        print(f"{Colors.GREEN}Experiment completed successfully{Colors.RESET}")
-                    else:
-                        print(f"{Colors.YELLOW}Experiment stopped{Colors.RESET}")
-                    
-                except ValueError as e:
-                    print(f"{Colors.RED}Invalid experiment parameters: {e}{Colors.RESET}")
-            
-            elif command.lower().startswith('expraw '):
-                try:
-                    parts = command[7:].split()
-                    if len(parts) != 4:
-                        print(f"{Colors.YELLOW}Usage: expraw START_TEMP STOP_TEMP INCREMENT STAB_TIME{Colors.RESET}")
-                        return True
-                    
-                    start_temp = float(parts[0])
-                    stop_temp = float(parts[1])
-                    increment = float(parts[2])
-                    stab_time = int(parts[3])
-                    
-                    # Run experiment without correction
-                    if self.temp_control.run_experiment(start_temp, stop_temp, increment, stab_time, use_correction=False):
-                        print(f"{Colors.GREEN}Experiment completed successfully{Colors.RESET}")
-                    else:
-                        print(f"{Colors.YELLOW}Experiment stopped{Colors.RESET}")
-                    
-                except ValueError as e:
-                    print(f"{Colors.RED}Invalid experiment parameters: {e}{Colors.RESET}")
-            
-            elif command.lower() == 'stop':
-                if self.temp_control.stop_experiment():
-                    print(f"{Colors.GREEN}Experiment stopped{Colors.RESET}")
-                else:
-                    print(f"{Colors.YELLOW}No experiment running{Colors.RESET}")
-            
-            elif command.lower().startswith('save'):
-                parts = command.split(maxsplit=1)
-                filename = parts[1] if len(parts) > 1 else None
-                
-                saved_file = self.data_manager.save_to_csv(filename)
-                if saved_file:
-                    print(f"{Colors.GREEN}Data saved to {saved_file}{Colors.RESET}")
-                else:
-                    print(f"{Colors.RED}Failed to save data{Colors.RESET}")
-            
-            else:
-                print(f"{Colors.YELLOW}Unknown command: {command}. Type 'help' for available commands.{Colors.RESET}")
+        verb, _, args = command.strip().partition(' ')
+        handler = self.commands.get(verb.lower())
+        
+        if handler is None:
+            print(f"{Colors.YELLOW}Unknown command: {command}. Type 'help' for available commands.{Colors.RESET}")
+            return True
         
+        try:
+            return handler(args.strip()) is not False
         except Exception as e:
             logging.error(f"Error handling command: {e}")
             print(f"{Colors.RED}Error: {e}{Colors.RESET}")
         
         return True
     
-    def run(self):
-        """Run the interactive mode."""
+    def run(self, stop_event=None):
+        """
+        Run the interactive mode.
+        
+        Args:
+            stop_event: Optional threading.Event that ends the mode when set
+        """
         self.running = True
+        enable_history()
         self.print_help()
         
         try:
-            while self.running:
-                command = input(f"\n{Colors.CYAN}> {Colors.RESET}").strip()
-                
+            for command in iter_commands(_PROMPT, stop_event):
                 if not self.handle_command(command):
-                    self.running = False
+                    break
+            self.running = False
         
         except KeyboardInterrupt:
             logging.info("Interactive mode interrupted")
             print(f"\n{Colors.YELLOW}Interactive mode interrupted{Colors.RESET}")
             self.running = False
         
-        return True
\ No newline at end of file
+        return True
+    
+    def run_script(self, filename, stop_event=None):
+        """
+        Run the commands in a script file without prompting.
+        
+        Each line holds one interactive-mode command; blank lines and lines
+        starting with '#' are skipped. The script ends early on 'exit'.
+        
+        Args:
+            filename: Path to the command script
+            stop_event: Optional threading.Event that ends the script when set
+            
+        Returns:
+            Boolean indicating whether the script could be read
+        """
+        try:
+            script = open(filename, 'r', encoding='utf-8', buffering=65536)
+        except OSError as e:
+            logging.error(f"Error opening script {filename}: {e}")
+            return False
+        
+        logging.info(f"Running command script {filename}")
+        self.running = True
+        
+        try:
+            with script:
+                for line in script:
+                    if stop_event is not None and stop_event.is_set():
+                        break
+                    
+                    command = line.strip()
+                    if not command or command.startswith('#'):
+                        continue
+                    
+                    print(_SCRIPT_ECHO + command)
+                    if not self.handle_command(command):
+                        break
+        
+        except KeyboardInterrupt:
+            logging.info("Command script interrupted")
+            print(f"\n{Colors.YELLOW}Command script interrupted{Colors.RESET}")
+        
+        finally:
+            self.running = False
+        
+        return True
@@ -6,16 +6,23 @@ This module provides functions to read and write configuration settings.
 """
 
 import os
+import json
 import configparser
 import logging
 
 # Default config file path
 DEFAULT_CONFIG_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config.ini')
 
+# Raw values of config files already parsed: path -> ((mtime_ns, size), {section: {key: value}})
+_config_cache = {}
+
 def read_config(config_file=None):
     """
     Read configuration from file.
     
+    The file is only parsed again when its modification time or size has
+    changed; otherwise a new ConfigParser is filled from the cached values.
+    
     Args:
         config_file: Path to config file (uses default if None)
         
@@ -26,18 +33,32 @@ def read_config(config_file=None):
     
     config = configparser.ConfigParser()
     
-    if os.path.exists(config_file):
-        try:
-            config.read(config_file)
-            logging.info(f"Configuration loaded from {config_file}")
-        except Exception as e:
-            logging.error(f"Error loading configuration from {config_file}: {e}")
-            # Create default config
-            create_default_config(config)
-    else:
+    try:
+        stat = os.stat(config_file)
+    except OSError:
         logging.warning(f"Config file {config_file} not found, using default settings")
         # Create default config
         create_default_config(config)
+        return config
+    
+    version = (stat.st_mtime_ns, stat.st_size)
+    cached = _config_cache.get(config_file)
+    if cached is not None and cached[0] == version:
+        config.read_dict(cached[1])
+        return config
+    
+    try:
+        config.read(config_file)
+        logging.info(f"Configuration loaded from {config_file}")
+        
+        # Keep the raw (uninterpolated) values, so they can be read back unchanged
+        values = {section: dict(config.items(section, raw=True)) for section in config.sections()}
+        values[config.default_section] = dict(config.defaults())
+        _config_cache[config_file] = (version, values)
+    except Exception as e:
+        logging.error(f"Error loading configuration from {config_file}: {e}")
+        # Create default config
+        create_default_config(config)
     
     return config
 
@@ -86,6 +107,9 @@ def save_config(config, config_file=None):
         with open(config_file, 'w') as f:
             config.write(f)
         
+        # Parse the new contents on the next read, even if the file time did not change
+        _config_cache.pop(config_file, None)
+        
         logging.info(f"Configuration saved to {config_file}")
         return True
     except Exception as e:
@@ -180,10 +204,6 @@ def save_interpolation_data(interp_data, filename=None):
     Returns:
         Boolean indicating success
     """
-    import os
-    import json
-    import logging
-    
     # Default filename if not provided
     if filename is None:
         filename = os.path.join(os.path.dirname(DEFAULT_CONFIG_FILE), 'temp_correction_interp.json')
@@ -212,10 +232,6 @@ def load_interpolation_data(filename=None):
     Returns:
         Dict with interpolation data or None if file not found or error
     """
-    import os
-    import json
-    import logging
-    
     # Default filename if not provided
     if filename is None:
         filename = os.path.join(os.path.dirname(DEFAULT_CONFIG_FILE), 'temp_correction_interp.json')
@@ -5,10 +5,13 @@ Logger Utility
 This module provides a centralized logging configuration.
 """
 
+import atexit
 import logging
 import os
+import queue
 import sys
-from datetime import datetime
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 # ANSI color codes for colored terminal output
 class Colors:
@@ -20,7 +23,37 @@ class Colors:
     PURPLE = "\033[95m"
     CYAN = "\033[96m"
 
-class ColoredFormatter(logging.Formatter):
+# Without a terminal (output redirected to a file or pipe) the codes are just noise,
+# so blank them before other modules build their templates from them
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    for _name in ("RESET", "RED", "GREEN", "YELLOW", "BLUE", "PURPLE", "CYAN"):
+        setattr(Colors, _name, "")
+    del _name
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that formats the timestamp only once per second.
+    
+    Records logged within the same second reuse the strftime result; only
+    the milliseconds are added per record.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, formatted time), replaced as a whole so threads never see a mixed pair
+        self._cached_time = (None, "")
+    
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, formatted)
+        if datefmt:
+            return formatted
+        return self.default_msec_format % (formatted, record.msecs)
+
+class ColoredFormatter(CachedTimeFormatter):
     """Custom formatter with colored output for terminal."""
     
     COLORS = {
@@ -31,17 +64,71 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: Colors.PURPLE
     }
     
+    def __init__(self, *args, stream=None, **kwargs):
+        """
+        Args:
+            stream: Stream the formatted records are written to (sys.stdout if None);
+                colors are only used when it is a terminal
+        """
+        super().__init__(*args, **kwargs)
+        stream = sys.stdout if stream is None else stream
+        self._color_enabled = stream.isatty() and not os.environ.get("NO_COLOR")
+    
     def format(self, record):
-        if hasattr(sys, 'ps1'):  # Check if running in interactive mode
+        # Color the formatted line instead of the record, which other handlers share
+        message = super().format(record)
+        if self._color_enabled:
             level_color = self.COLORS.get(record.levelno, Colors.RESET)
-            record.levelname = f"{level_color}{record.levelname}{Colors.RESET}"
-            record.msg = f"{level_color}{record.msg}{Colors.RESET}"
-        return super().format(record)
+            message = f"{level_color}{message}{Colors.RESET}"
+        return message
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that leaves flushing to its caller.
+    
+    Records are written into a large file buffer; only warnings and errors
+    are flushed right away. The queue listener in setup_logger flushes
+    whenever it has no more records waiting.
+    """
+    
+    def __init__(self, filename, buffer_size=64 * 1024, **kwargs):
+        self.buffer_size = buffer_size
+        super().__init__(filename, **kwargs)
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+class _BatchingQueueListener(QueueListener):
+    """Queue listener that flushes its handlers once the queue runs empty."""
+    
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
 
 def setup_logger(name=None, log_file=None, level=logging.INFO, console=True):
     """
     Set up a logger with file and console handlers.
     
+    File output goes through a queue to a listener thread, so the thread that
+    logs never waits for the disk, and a burst of records is written to the
+    file with a single flush. The listener is kept as `logger.listener`
+    and is stopped (flushing pending records) at exit.
+    
     Args:
         name: Logger name (or root logger if None)
         log_file: Path to log file (no file logging if None)
@@ -58,21 +145,27 @@ def setup_logger(name=None, log_file=None, level=logging.INFO, console=True):
     # Clear any existing handlers
     if logger.hasHandlers():
         logger.handlers.clear()
+    stop_listener(logger)
     
     # Create formatters
-    file_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-    console_formatter = ColoredFormatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_formatter = CachedTimeFormatter('%(asctime)s - %(levelname)s - %(message)s')
+    console_formatter = ColoredFormatter('%(asctime)s - %(levelname)s - %(message)s', stream=sys.stdout)
     
     # Add file handler if log_file is specified
     if log_file:
         # Ensure log directory exists
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
             
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        
+        log_queue = queue.SimpleQueue()
+        logger.listener = _BatchingQueueListener(log_queue, file_handler)
+        logger.listener.start()
+        atexit.register(stop_listener, logger)
+        logger.addHandler(QueueHandler(log_queue))
     
     # Add console handler if console is True
     if console:
@@ -82,13 +175,29 @@ def setup_logger(name=None, log_file=None, level=logging.INFO, console=True):
     
     return logger
 
+def stop_listener(logger):
+    """
+    Stop the file listener of a logger set up by setup_logger, if it has one.
+    
+    Records still queued are written and the log file is closed.
+    
+    Args:
+        logger: Logger returned by setup_logger
+    """
+    listener = getattr(logger, 'listener', None)
+    if listener is None:
+        return
+    logger.listener = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
 def get_default_log_file():
     """Generate a default log file name based on current date/time."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     logs_dir = "logs"
     
     # Create logs directory if it doesn't exist
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
+    os.makedirs(logs_dir, exist_ok=True)
     
     return os.path.join(logs_dir, f"thermal_control_{timestamp}.log")
\ No newline at end of file
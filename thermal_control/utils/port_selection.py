@@ -6,13 +6,47 @@ This module provides functions for selecting serial ports interactively.
 """
 
 import logging
+import os
+import time
 
-def list_available_ports():
-    """List all available serial ports."""
-    try:
-        import serial.tools.list_ports
-        ports = list(serial.tools.list_ports.comports())
+from thermal_control.utils.prompt import confirm
+
+# Seconds a port scan is reused before the ports are enumerated again
+PORT_CACHE_TTL = 5.0
+
+# (monotonic time of the scan, ports found)
+_port_cache = (None, ())
+
+def _list_ports_cached(max_age=PORT_CACHE_TTL):
+    """
+    Enumerate serial ports, reusing a scan that is less than max_age seconds old.
+    
+    The TEC and Arduino lookups during startup share one scan, while a board
+    plugged in later is still found once the scan has expired.
+    """
+    global _port_cache
+    scanned_at, ports = _port_cache
+    now = time.monotonic()
+    if scanned_at is not None and now - scanned_at < max_age:
         return ports
+    
+    import serial.tools.list_ports
+    ports = tuple(serial.tools.list_ports.comports())
+    _port_cache = (now, ports)
+    return ports
+
+def list_available_ports(refresh=False):
+    """
+    List all available serial ports.
+    
+    Args:
+        refresh: Re-enumerate the ports instead of reusing a recent scan
+        
+    Returns:
+        List of port objects
+    """
+    try:
+        return list(_list_ports_cached(max_age=0.0 if refresh else PORT_CACHE_TTL))
     except ImportError:
         logging.error("pyserial not installed. Please install with 'pip install pyserial'")
         return []
@@ -29,9 +63,8 @@ def print_available_ports(ports=None):
         print("\nNo serial ports detected.")
         return
     
-    print("\nDetected serial ports:")
-    for i, p in enumerate(ports):
-        print(f"  {i+1}: {p.device} - {p.description}")
+    lines = [f"  {i+1}: {p.device} - {p.description}" for i, p in enumerate(ports)]
+    print("\nDetected serial ports:\n" + "\n".join(lines))
     return ports
 
 def select_port(prompt, ports=None, default=None):
@@ -75,13 +108,56 @@ def select_port(prompt, ports=None, default=None):
         print(f"Using port: {port_input}")
         return port_input
 
+def _is_arduino(description):
+    """Check whether a port description looks like an Arduino."""
+    return "Arduino" in description or "Uno" in description
+
+def _is_tec(description):
+    """Check whether a port description looks like a TEC controller."""
+    # TEC controllers are often USB-Serial devices without specific identifiers
+    # Look for USB-Serial devices that aren't Arduino
+    return "USB" in description and "Serial" in description and not _is_arduino(description)
+
+def detect_ports(ports=None):
+    """
+    Try to automatically detect both the TEC controller and Arduino ports.
+    
+    Args:
+        ports: List of port objects (optional, will be retrieved if None)
+        
+    Returns:
+        Tuple of (tec_port, arduino_port), None where not detected
+    """
+    if ports is None:
+        ports = list_available_ports()
+    
+    tec_port, arduino_port = None, None
+    for p in ports:
+        if arduino_port is None and _is_arduino(p.description):
+            arduino_port = p.device
+        elif tec_port is None and _is_tec(p.description):
+            tec_port = p.device
+        if tec_port and arduino_port:
+            break
+    
+    if tec_port:
+        logging.info(f"Potentially detected TEC controller on {tec_port}")
+    else:
+        logging.info("TEC controller not automatically detected")
+    if arduino_port:
+        logging.info(f"Detected Arduino on {arduino_port}")
+    else:
+        logging.info("Arduino not automatically detected")
+    
+    return tec_port, arduino_port
+
 def detect_arduino_port(ports=None):
     """Try to automatically detect Arduino port."""
     if ports is None:
         ports = list_available_ports()
     
     for p in ports:
-        if "Arduino" in p.description or "Uno" in p.description:
+        if _is_arduino(p.description):
             logging.info(f"Detected Arduino on {p.device}")
             return p.device
     
@@ -93,47 +169,64 @@ def detect_tec_port(ports=None):
     if ports is None:
         ports = list_available_ports()
     
-    # TEC controllers are often USB-Serial devices without specific identifiers
-    # Look for USB-Serial devices that aren't Arduino
     for p in ports:
-        if "USB" in p.description and "Serial" in p.description and not ("Arduino" in p.description or "Uno" in p.description):
+        if _is_tec(p.description):
             logging.info(f"Potentially detected TEC controller on {p.device}")
             return p.device
     
     logging.info("TEC controller not automatically detected")
     return None
 
-def select_ports_interactive():
+def select_ports_interactive(tec_port=None, arduino_port=None, assume_yes=False):
     """
     Interactively select TEC and Arduino ports.
     
+    Ports that are already given (e.g. on the command line, or in the
+    TEC_PORT / ARDUINO_PORT environment variables) are kept and not asked
+    for again; the serial ports are only listed if one is missing.
+    
+    Args:
+        tec_port: Known TEC controller port (optional)
+        arduino_port: Known Arduino port (optional)
+        assume_yes: Never prompt: use auto-detected ports without asking to
+            confirm them, and run without an Arduino if none is detected
+        
     Returns:
         Tuple of (tec_port, arduino_port)
+        
+    Raises:
+        RuntimeError: If assume_yes is set and no TEC controller port is known or detected
     """
+    tec_port = tec_port or os.environ.get('TEC_PORT')
+    arduino_port = arduino_port or os.environ.get('ARDUINO_PORT')
+    if tec_port and arduino_port:
+        return tec_port, arduino_port
+    
     ports = list_available_ports()
     
-    # Try to auto-detect ports
-    tec_port = detect_tec_port(ports)
-    arduino_port = detect_arduino_port(ports)
+    # Try to auto-detect ports in one pass over the list
+    detected_tec_port, detected_arduino_port = detect_ports(ports)
     
     # Let user select or confirm TEC port
-    if tec_port:
-        confirm = input(f"\nUse detected TEC controller port ({tec_port})? (y/n): ")
-        if confirm.lower() != 'y':
+    if not tec_port:
+        tec_port = detected_tec_port
+        if tec_port:
+            if not confirm(f"\nUse detected TEC controller port ({tec_port})? (y/n): ", assume_yes=assume_yes):
+                tec_port = select_port("Select TEC controller port", ports)
+        elif assume_yes:
+            raise RuntimeError("TEC controller port not detected, give it with --tec-port or TEC_PORT")
+        else:
             tec_port = select_port("Select TEC controller port", ports)
-    else:
-        tec_port = select_port("Select TEC controller port", ports)
     
     # Let user select or confirm Arduino port
-    if arduino_port:
-        confirm = input(f"\nUse detected Arduino port ({arduino_port})? (y/n): ")
-        if confirm.lower() != 'y':
+    if not arduino_port:
+        arduino_port = detected_arduino_port
+        if arduino_port:
+            if not confirm(f"\nUse detected Arduino port ({arduino_port})? (y/n): ", assume_yes=assume_yes):
+                arduino_port = select_port("Select Arduino port", ports)
+        elif assume_yes:
+            logging.info("Arduino not detected, continuing without it")
+        elif confirm("\nDo you want to use an Arduino for additional temperature monitoring? (y/n): "):
             arduino_port = select_port("Select Arduino port", ports)
-    else:
-        use_arduino = input("\nDo you want to use an Arduino for additional temperature monitoring? (y/n): ")
-        if use_arduino.lower() == 'y':
-            arduino_port = select_port("Select Arduino port", ports)
-        else:
-            arduino_port = None
     
-    return tec_port, arduino_port
\ No newline at end of file
+    return tec_port, arduino_port
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Prompt Utility
+
+This module provides helpers for reading commands from the user.
+"""
+
+import os
+import sys
+import atexit
+import queue
+import threading
+
+# Line editing and history for input(); not available on all platforms
+try:
+    import readline
+except ImportError:
+    readline = None
+
+# Command history shared by the interactive and direct command modes
+HISTORY_FILE = os.path.expanduser("~/.thermal_control_history")
+
+_history_enabled = False
+
+def enable_history(filename=HISTORY_FILE, length=1000):
+    """
+    Load the command history and save it again when the program exits.
+    
+    Does nothing if stdin is not a terminal or the readline module is not available.
+    
+    Args:
+        filename: History file path
+        length: Maximum number of commands kept in the file
+    """
+    global _history_enabled
+    if readline is None or _history_enabled or not sys.stdin.isatty():
+        return
+    
+    try:
+        readline.read_history_file(filename)
+    except OSError:
+        pass  # No history yet
+    readline.set_history_length(length)
+    
+    def save_history():
+        try:
+            readline.write_history_file(filename)
+        except OSError:
+            pass
+    
+    atexit.register(save_history)
+    _history_enabled = True
+
+def confirm(prompt, default=False, assume_yes=False):
+    """
+    Ask a yes/no question.
+    
+    Only the answer line is read, with no readline editing, so answers can
+    also be piped in. For an empty answer, or at the end of input, the
+    default is returned instead of blocking or raising EOFError.
+    
+    If a command prompt was stopped while its input() was still waiting
+    (see iter_commands), the answer is taken from that pending read, so the
+    two never compete for stdin.
+    
+    Args:
+        prompt: Question to display, e.g. "Proceed? (y/n): "
+        default: Answer to use for an empty answer or at the end of input
+        assume_yes: Return True without asking (e.g. for a --yes option)
+        
+    Returns:
+        Boolean answer
+    """
+    if assume_yes:
+        return True
+    
+    answer = _read_line(prompt)
+    if answer is None or not answer.strip():
+        return default
+    return answer.strip().lower().startswith('y')
+
+# Thread reading the current input() line and the queue it delivers lines to
+# (None at the end of input); one thread at a time, as they share the terminal
+_input_thread = None
+_input_lines = queue.Queue()
+
+def _read_input(prompt):
+    """Read one line with input() and queue it (None at the end of input)."""
+    try:
+        _input_lines.put(input(prompt))
+    except EOFError:
+        _input_lines.put(None)
+
+def _input_until(prompt, stop_event, poll_interval):
+    """
+    Read a line with input() on a helper thread until stop_event is set.
+    
+    A line still being entered when the event is set is not lost; it is
+    returned by the next call instead of prompting again.
+    
+    Returns:
+        The line, or None at the end of input or once stop_event is set
+    """
+    global _input_thread
+    if _input_thread is None or not _input_thread.is_alive():
+        if _input_lines.empty():
+            _input_thread = threading.Thread(target=_read_input, args=(prompt,),
+                                             name="prompt-input", daemon=True)
+            _input_thread.start()
+    
+    while not stop_event.is_set():
+        try:
+            return _input_lines.get(timeout=poll_interval)
+        except queue.Empty:
+            pass
+    return None
+
+def _read_line(prompt):
+    """
+    Show a prompt and read one line from stdin.
+    
+    Returns:
+        The line, or None at the end of input
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    
+    # An input() left waiting by a stopped command prompt owns stdin, take its line
+    if (_input_thread is not None and _input_thread.is_alive()) or not _input_lines.empty():
+        return _input_lines.get()
+    
+    line = sys.stdin.readline()
+    return line if line else None
+
+def iter_commands(prompt, stop_event=None, poll_interval=0.5):
+    """
+    Yield commands entered by the user until the end of input.
+    
+    At a terminal the prompt is shown through input(), with readline line
+    editing and history (see enable_history) where available. When stdin is
+    piped (e.g. a file of commands), lines are taken straight from the
+    buffered stream without printing a prompt for each one.
+    
+    If stop_event is given, input() runs on a helper thread and the loop ends
+    within poll_interval once the event is set (e.g. by a signal handler),
+    instead of staying blocked until the next line is entered.
+    
+    Args:
+        prompt: Prompt to display when running at a terminal
+        stop_event: Optional threading.Event that ends the loop when set
+        poll_interval: Seconds between checks of stop_event while waiting
+        
+    Yields:
+        Stripped command strings
+    """
+    if not sys.stdin.isatty():
+        for line in sys.stdin:
+            if stop_event is not None and stop_event.is_set():
+                return
+            yield line.strip()
+        return
+    
+    if stop_event is None:
+        while True:
+            try:
+                yield input(prompt).strip()
+            except EOFError:
+                return
+    
+    while True:
+        line = _input_until(prompt, stop_event, poll_interval)
+        if line is None:
+            return
+        yield line.strip()